@@ -0,0 +1,68 @@
+"""
+Tempo da etapa de anotação do /detect com 1, 10 e 50 caixas, comparando o
+carregamento da fonte a cada caixa (comportamento anterior) com o
+AnnotationRenderer, que resolve a fonte uma vez e mantém um cache por tamanho.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.annotation_benchmark --iterations 20
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+from PIL import Image, ImageFont
+
+from utils.annotation_renderer import AnnotationRenderer, FONT_CANDIDATES
+
+
+class UncachedRenderer(AnnotationRenderer):
+    def __init__(self):
+        super().__init__()
+        self.get_font = self._load_font_every_time
+
+    @staticmethod
+    def _load_font_every_time(font_size: int):
+        for font_path in FONT_CANDIDATES:
+            try:
+                return ImageFont.truetype(font_path, size=font_size)
+            except IOError:
+                continue
+        return ImageFont.load_default()
+
+
+def random_boxes(count: int, size: int, rng):
+    boxes = []
+    for _ in range(count):
+        xmin, ymin = rng.integers(0, size - 200, 2)
+        width, height = rng.integers(40, 200, 2)
+        boxes.append([xmin, ymin, xmin + width, ymin + height])
+    return np.array(boxes, dtype=np.float32), rng.random(count).astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--size', type=int, default=1024)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    image = Image.fromarray(rng.integers(0, 256, (args.size, args.size, 3), dtype=np.uint8))
+
+    renderers = {"per-box load": UncachedRenderer(), "cached": AnnotationRenderer()}
+
+    print(f"{'boxes':>6} {'renderer':>13} {'median ms':>10}")
+    for count in (1, 10, 50):
+        boxes, scores = random_boxes(count, args.size, rng)
+        for name, renderer in renderers.items():
+            renderer.draw(image, boxes, scores)
+            timings = []
+            for _ in range(args.iterations):
+                start = time.perf_counter()
+                renderer.draw(image, boxes, scores)
+                timings.append((time.perf_counter() - start) * 1000)
+            print(f"{count:>6} {name:>13} {statistics.median(timings):>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
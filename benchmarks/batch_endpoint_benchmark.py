@@ -0,0 +1,74 @@
+"""
+Compara N chamadas sequenciais ao /predict (ou /detect) com uma única
+chamada ao /predict/batch (ou /detect/batch), enviando os arquivos
+separados e compactados em um zip.
+
+Todas as requisições usam "Cache-Control: no-store" para que o cache de
+resultados não mascare o custo da inferência.
+
+Uso (com a API em execução, na raiz do projeto):
+    python -m benchmarks.batch_endpoint_benchmark --image exemplo.jpg --count 32 --route predict
+"""
+import argparse
+import io
+import os
+import time
+import zipfile
+
+import httpx
+
+
+def sequential(client: httpx.Client, url: str, route: str, images: list):
+    start = time.perf_counter()
+    errors = 0
+    for index, image in enumerate(images):
+        response = client.post(f"{url}/{route}", files={"file": (f"{index}.jpg", image, "image/jpeg")})
+        errors += response.status_code != 200
+    return time.perf_counter() - start, errors
+
+
+def batch_files(client: httpx.Client, url: str, route: str, images: list):
+    files = [("files", (f"{index}.jpg", image, "image/jpeg")) for index, image in enumerate(images)]
+    start = time.perf_counter()
+    response = client.post(f"{url}/{route}/batch", files=files)
+    return time.perf_counter() - start, response.json().get("failed", len(images)) if response.status_code == 200 else len(images)
+
+
+def batch_zip(client: httpx.Client, url: str, route: str, images: list):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for index, image in enumerate(images):
+            archive.writestr(f"{index}.jpg", image)
+    start = time.perf_counter()
+    response = client.post(f"{url}/{route}/batch", files=[("files", ("study.zip", buffer.getvalue(), "application/zip"))])
+    return time.perf_counter() - start, response.json().get("failed", len(images)) if response.status_code == 200 else len(images)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--image', required=True)
+    parser.add_argument('--count', type=int, default=32)
+    parser.add_argument('--route', choices=['predict', 'detect'], default='predict')
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--api-key', default=os.getenv('api_key', ''))
+    parser.add_argument('--token', default='')
+    args = parser.parse_args()
+
+    with open(args.image, 'rb') as file:
+        images = [file.read()] * args.count
+
+    headers = {"api_key": args.api_key, "Cache-Control": "no-store"}
+    if args.token:
+        headers["Authorization"] = f"Bearer {args.token}"
+
+    print(f"{'mode':>12} {'images':>7} {'seconds':>8} {'images/s':>9} {'errors':>7}")
+    with httpx.Client(timeout=600, headers=headers) as client:
+        # Aquecimento para não medir a primeira chamada do modelo
+        sequential(client, args.url, args.route, images[:2])
+        for name, run in (('sequential', sequential), ('batch', batch_files), ('batch zip', batch_zip)):
+            elapsed, errors = run(client, args.url, args.route, images)
+            print(f"{name:>12} {len(images):>7} {elapsed:>8.2f} {len(images) / elapsed:>9.2f} {errors:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Compara os formatos de resposta do /detect: JSON com base64, multipart/mixed,
+image/jpeg binário e URL de resultado.
+
+Sem --url, mede apenas o tamanho e o custo de serialização com uma imagem
+anotada sintética. Com --url (API em execução), mede também o tempo até o
+primeiro byte e o tempo total visto pelo cliente.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.detect_response_benchmark --image mamografia.jpg --url http://127.0.0.1:8000
+"""
+import argparse
+import base64
+import io
+import json
+import os
+import statistics
+import time
+
+import httpx
+import numpy as np
+from PIL import Image
+
+from utils.multipart_response import build_multipart_mixed
+
+DETECTIONS = [{"class_id": 1, "confidence": 0.91, "bbox": [120, 340, 260, 470]}]
+
+
+def synthetic_jpeg(size: int = 1024):
+    rng = np.random.default_rng(0)
+    array = rng.integers(0, 256, (size, size, 3), dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(array).save(buffer, format='JPEG', quality=95)
+    return buffer.getvalue()
+
+
+def serialize_json(image: bytes):
+    return json.dumps({"detections": DETECTIONS, "image": base64.b64encode(image).decode('utf-8')}).encode('utf-8')
+
+
+def serialize_multipart(image: bytes):
+    return build_multipart_mixed(DETECTIONS, image)[0]
+
+
+def serialize_binary(image: bytes):
+    json.dumps(DETECTIONS)
+    return image
+
+
+def measure_serialization(image: bytes, iterations: int):
+    print(f"{'format':>10} {'bytes':>10} {'cpu ms':>8}")
+    for name, serialize in (('json', serialize_json), ('multipart', serialize_multipart), ('image', serialize_binary)):
+        start = time.process_time()
+        for _ in range(iterations):
+            body = serialize(image)
+        cpu_ms = (time.process_time() - start) * 1000 / iterations
+        print(f"{name:>10} {len(body):>10} {cpu_ms:>8.3f}")
+
+
+def measure_client(url: str, image: bytes, iterations: int, headers: dict):
+    print(f"\n{'output':>10} {'bytes':>10} {'ttfb ms':>9} {'total ms':>9}")
+    with httpx.Client(timeout=600, headers=headers) as client:
+        for output in ('json', 'multipart', 'image', 'url'):
+            ttfb, total, size = [], [], 0
+            for _ in range(iterations):
+                start = time.perf_counter()
+                with client.stream('POST', f"{url}/detect", params={"output": output},
+                                   files={"file": ("image.jpg", image, "image/jpeg")}) as response:
+                    chunks = response.iter_bytes()
+                    first = next(chunks, b'')
+                    ttfb.append((time.perf_counter() - start) * 1000)
+                    body = first + b''.join(chunks)
+                    size = len(body)
+                if output == 'url':
+                    # Inclui o download da imagem pela URL de resultado
+                    size += len(client.get(f"{url}{json.loads(body)['image_url']}").content)
+                total.append((time.perf_counter() - start) * 1000)
+            print(f"{output:>10} {size:>10} {statistics.median(ttfb):>9.1f} {statistics.median(total):>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--image')
+    parser.add_argument('--url')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--api-key', default=os.getenv('api_key', ''))
+    parser.add_argument('--token', default='')
+    args = parser.parse_args()
+
+    if args.image:
+        with open(args.image, 'rb') as file:
+            image = file.read()
+    else:
+        image = synthetic_jpeg()
+
+    measure_serialization(image, args.iterations)
+
+    if args.url:
+        headers = {"api_key": args.api_key}
+        if args.token:
+            headers["Authorization"] = f"Bearer {args.token}"
+        measure_client(args.url, image, args.iterations, headers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Compara o pipeline anterior de decodificação do /detect (PIL + LANCZOS +
+numpy + ToTensor) com decode_and_resize em cada modo de reamostragem, para
+JPEGs de 3000-4000 px como os exportados do DICOM.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.image_decode_benchmark --images exports/*.jpg
+"""
+import argparse
+import io
+import statistics
+import time
+
+import numpy as np
+from PIL import Image
+from torchvision.transforms import ToTensor
+
+from utils.image_decoder import decode_and_resize, target_size, RESAMPLING_MODES
+
+
+def legacy_pipeline(image_data: bytes, max_dimension: int):
+    image = Image.open(io.BytesIO(image_data)).convert('RGB')
+    size = target_size(image.width, image.height, max_dimension)
+    if size != image.size:
+        image = image.resize(size, Image.Resampling.LANCZOS)
+    image_np = np.array(image)
+    return image, image_np, ToTensor()(image)
+
+
+def synthetic_exports():
+    rng = np.random.default_rng(0)
+    images = []
+    for width, height in ((3000, 4000), (3328, 4096), (4000, 3000)):
+        # Ruído suavizado para aproximar a compressibilidade de uma mamografia
+        base = rng.integers(0, 256, (height // 16, width // 16), dtype=np.uint8)
+        image = Image.fromarray(base).resize((width, height), Image.Resampling.BICUBIC)
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', quality=95)
+        images.append(buffer.getvalue())
+    return images
+
+
+def median_ms(func, images, iterations):
+    timings = []
+    for _ in range(iterations):
+        for image_data in images:
+            start = time.perf_counter()
+            func(image_data)
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--images', nargs='*')
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--max-dimension', type=int, default=1024)
+    args = parser.parse_args()
+
+    if args.images:
+        images = []
+        for path in args.images:
+            with open(path, 'rb') as file:
+                images.append(file.read())
+    else:
+        images = synthetic_exports()
+
+    print(f"{'pipeline':>18} {'median ms':>10}")
+    legacy = median_ms(lambda data: legacy_pipeline(data, args.max_dimension), images, args.iterations)
+    print(f"{'legacy (LANCZOS)':>18} {legacy:>10.1f}")
+
+    for mode in RESAMPLING_MODES:
+        elapsed = median_ms(lambda data: decode_and_resize(data, args.max_dimension, mode), images, args.iterations)
+        print(f"{'draft + ' + mode:>18} {elapsed:>10.1f}  ({legacy / elapsed:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Teste de carga do /predict com o micro-batching ligado e desligado.
+
+Sobe a API com uvicorn para cada configuração, dispara requisições
+concorrentes e informa a vazão e a latência p50/p99.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.load_test_predict --image exemplo.jpg --requests 256 --concurrency 32
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+
+async def wait_until_up(base_url: str, timeout: float = 300):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(f"{base_url}/")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(1)
+    raise RuntimeError("API did not start in time")
+
+
+async def run_load(base_url: str, image: bytes, total: int, concurrency: int, headers: dict):
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(timeout=300, headers=headers) as client:
+        async def one_request():
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(f"{base_url}/predict", files={"file": ("image.jpg", image, "image/jpeg")})
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_request() for _ in range(total)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "throughput": total / elapsed,
+        "p50": float(np.percentile(latencies, 50)),
+        "p99": float(np.percentile(latencies, 99)),
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--image', required=True)
+    parser.add_argument('--requests', type=int, default=256)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-batch-size', type=int, default=8)
+    parser.add_argument('--max-wait-ms', type=float, default=10)
+    parser.add_argument('--api-key', default=os.getenv('api_key', ''))
+    parser.add_argument('--token', default='')
+    args = parser.parse_args()
+
+    with open(args.image, 'rb') as file:
+        image = file.read()
+
+    headers = {"api_key": args.api_key}
+    if args.token:
+        headers["Authorization"] = f"Bearer {args.token}"
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    print(f"{'batching':>9} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+
+    for enabled in (False, True):
+        env = {
+            **os.environ,
+            "PREDICT_BATCHING_ENABLED": str(enabled).lower(),
+            "PREDICT_MAX_BATCH_SIZE": str(args.max_batch_size),
+            "PREDICT_MAX_WAIT_MS": str(args.max_wait_ms),
+            "INFERENCE_QUEUE_SIZE": str(args.requests),
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port), "--log-level", "warning"],
+            env=env
+        )
+        try:
+            asyncio.run(wait_until_up(base_url))
+            # Aquecimento para não medir a primeira chamada do modelo
+            asyncio.run(run_load(base_url, image, 4, 1, headers))
+            result = asyncio.run(run_load(base_url, image, args.requests, args.concurrency, headers))
+        finally:
+            server.terminate()
+            server.wait()
+
+        print(f"{'on' if enabled else 'off':>9} {result['throughput']:>8.2f} "
+              f"{result['p50']:>9.1f} {result['p99']:>9.1f} {result['errors']:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Mede logins por segundo no /login de uma API em execução.
+
+Para comparar antes e depois do pool de conexões, rode contra uma instância
+na revisão anterior e outra na atual, com o mesmo banco:
+    python -m benchmarks.login_benchmark --url http://127.0.0.1:8000 --email user@exemplo.com --password senha
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+import numpy as np
+
+
+async def run(url: str, payload: dict, total: int, concurrency: int, headers: dict):
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(timeout=60, headers=headers) as client:
+        async def one_login():
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(f"{url}/login", json=payload)
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_login() for _ in range(total)))
+        elapsed = time.perf_counter() - start
+
+    print(f"logins/s: {total / elapsed:.1f}")
+    print(f"p50: {np.percentile(latencies, 50):.1f} ms  p99: {np.percentile(latencies, 99):.1f} ms  errors: {errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--email', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--api-key', default=os.getenv('api_key', ''))
+    args = parser.parse_args()
+
+    asyncio.run(run(args.url, {"email": args.email, "password": args.password},
+                    args.requests, args.concurrency, {"api_key": args.api_key}))
+
+
+if __name__ == '__main__':
+    main()
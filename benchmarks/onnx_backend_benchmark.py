@@ -0,0 +1,117 @@
+"""
+Compara o backend ONNX Runtime do classificador respiratório com o YOLO em
+PyTorch: paridade da saída {doença: percentual}, latência por imagem e RSS
+do processo depois de carregar o modelo e predizer.
+
+Cada backend roda em um interpretador novo, para que a memória de um não
+conte no outro. O worker ONNX importa apenas models.onnx_backend (sem torch
+nem ultralytics), e o .onnx é exportado antes, no processo principal, para
+que o RSS medido seja o de um worker servindo com o ONNX Runtime.
+
+A paridade falha (código de saída 1) quando algum percentual difere mais
+que --tolerance pontos.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.onnx_backend_benchmark --images raio-x/*.jpg --tolerance 1
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import psutil
+
+
+def load_backend(backend: str, weights: str, threads: int):
+    if backend == 'onnx':
+        from models.onnx_backend import load_onnx_classifier
+        return load_onnx_classifier(weights, threads)
+
+    os.environ["RESPIRATORY_BACKEND"] = backend
+    if threads:
+        os.environ["TORCH_THREADS"] = str(threads)
+    from models.model import load_model
+    return load_model()
+
+
+def run_backend(backend: str, weights: str, images: list, iterations: int, threads: int):
+    from PIL import Image
+    from utils.probs_to_dictionary import probs_to_dictionary
+
+    start = time.perf_counter()
+    model = load_backend(backend, weights, threads)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    predictions = []
+    for path in images:
+        prediction = model(Image.open(path))[0]
+        predictions.append(probs_to_dictionary(prediction.probs, prediction.names))
+
+    timings = []
+    for _ in range(iterations):
+        for path in images:
+            image = Image.open(path)
+            start = time.perf_counter()
+            model(image)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "load_ms": load_ms,
+        "median_ms": statistics.median(timings),
+        "rss_mb": psutil.Process().memory_info().rss / (1024 * 1024),
+        "predictions": predictions
+    }
+
+
+def measure(backend: str, args):
+    command = [sys.executable, "-m", "benchmarks.onnx_backend_benchmark", "--worker", backend,
+               "--weights", args.weights, "--iterations", str(args.iterations), "--threads", str(args.threads), "--images", *args.images]
+    output = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def max_difference(expected: dict, actual: dict):
+    return max(abs(expected.get(name, 0.0) - actual.get(name, 0.0)) for name in set(expected) | set(actual))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--images', nargs='+', required=True)
+    parser.add_argument('--weights', default='models/best.pt')
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--threads', type=int, default=0)
+    parser.add_argument('--tolerance', type=float, default=1.0)
+    parser.add_argument('--worker', choices=['torch', 'onnx'])
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_backend(args.worker, args.weights, args.images, args.iterations, args.threads)))
+        return
+
+    # A exportação importa ultralytics e torch; feita aqui, não pesa no worker ONNX
+    from models.onnx_backend import export_onnx
+    export_onnx(args.weights)
+
+    results = {backend: measure(backend, args) for backend in ('torch', 'onnx')}
+
+    print(f"{'backend':>8} {'load ms':>9} {'median ms':>10} {'RSS MB':>8}")
+    for backend, result in results.items():
+        print(f"{backend:>8} {result['load_ms']:>9.0f} {result['median_ms']:>10.2f} {result['rss_mb']:>8.0f}")
+
+    failures = 0
+    for path, expected, actual in zip(args.images, results['torch']['predictions'], results['onnx']['predictions']):
+        difference = max_difference(expected, actual)
+        if difference > args.tolerance:
+            failures += 1
+            print(f"parity mismatch {path}: torch={expected} onnx={actual}")
+    print(f"parity: {len(args.images) - failures}/{len(args.images)} within {args.tolerance} points")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
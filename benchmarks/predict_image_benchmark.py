@@ -0,0 +1,102 @@
+"""
+Compara o caminho antigo de predict_image (save_txt + leitura de results.txt)
+com a extração em memória a partir do objeto Probs.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.predict_image_benchmark --iterations 50 --concurrency 64
+"""
+import argparse
+import io
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from models.model_registry import model_registry
+from utils.probs_to_dictionary import probs_to_dictionary
+
+
+def legacy_predict(image_data: bytes):
+    image = Image.open(io.BytesIO(image_data))
+    prediction = model_registry.get('respiratory')(image)
+    prediction[0].save_txt('results.txt')
+
+    result_dict = {}
+    with open('results.txt', 'r') as file:
+        for line in file:
+            value, disease = line.strip().split(' ', 1)
+            result_dict[disease] = float(value) * 100
+
+    if os.path.exists('results.txt'):
+        os.remove('results.txt')
+    return result_dict
+
+
+def in_memory_predict(image_data: bytes):
+    image = Image.open(io.BytesIO(image_data))
+    prediction = model_registry.get('respiratory')(image)
+    return probs_to_dictionary(prediction[0].probs, prediction[0].names)
+
+
+def synthetic_images(count: int, size: int = 512):
+    images = []
+    for seed in range(count):
+        rng = np.random.default_rng(seed)
+        array = rng.integers(0, 256, (size, size), dtype=np.uint8)
+        buffer = io.BytesIO()
+        Image.fromarray(array).convert('RGB').save(buffer, format='JPEG')
+        images.append(buffer.getvalue())
+    return images
+
+
+def measure_latency(predict, images, iterations):
+    timings = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        predict(images[i % len(images)])
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def count_contaminated(predict, images, expected, concurrency):
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda image: _safe(predict, image), images))
+    return sum(1 for result, reference in zip(results, expected) if result != reference)
+
+
+def _safe(predict, image):
+    try:
+        return predict(image)
+    except Exception as exc:
+        return repr(exc)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=64)
+    args = parser.parse_args()
+
+    images = synthetic_images(args.concurrency)
+
+    # Aquecimento para não contar a inicialização do ultralytics
+    in_memory_predict(images[0])
+
+    for name, predict in (('results.txt', legacy_predict), ('in-memory', in_memory_predict)):
+        timings = measure_latency(predict, images, args.iterations)
+        print(f"{name:>12}: mean={statistics.mean(timings):.2f} ms "
+              f"median={statistics.median(timings):.2f} ms "
+              f"p95={np.percentile(timings, 95):.2f} ms")
+
+    expected = [in_memory_predict(image) for image in images]
+    for name, predict in (('results.txt', legacy_predict), ('in-memory', in_memory_predict)):
+        mismatches = count_contaminated(predict, images, expected, args.concurrency)
+        print(f"{name:>12}: {mismatches}/{len(images)} mismatched results "
+              f"under {args.concurrency} concurrent requests")
+
+
+if __name__ == '__main__':
+    main()
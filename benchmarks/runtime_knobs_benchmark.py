@@ -0,0 +1,96 @@
+"""
+Speedup de cada ajuste do InferenceRuntime (models/runtime.py) em CPU:
+threads, inference_mode, channels_last, fusão conv+bn e torch.compile.
+
+Mede o Faster R-CNN (pesos reais se --faster-rcnn-weights existir, senão
+aleatórios, o que não altera o custo) e, com --yolo-weights, o classificador
+YOLO. Cada linha compara a mediana com a linha de base (no_grad, sem ajustes).
+
+Uso (na raiz do projeto, em uma máquina Linux sem GPU):
+    python -m benchmarks.runtime_knobs_benchmark --yolo-weights models/best.pt --threads 1 2 4
+"""
+import argparse
+import os
+import statistics
+import time
+
+import torch
+import torchvision
+from torchvision.models.detection.faster_rcnn import FastRCNNPredictor
+
+from models.runtime import InferenceRuntime
+
+KNOBS = {
+    "baseline": {"inference_mode": False},
+    "inference_mode": {"inference_mode": True},
+    "channels_last": {"inference_mode": True, "channels_last": True},
+    "fuse_conv_bn": {"inference_mode": True, "fuse_conv_bn": True},
+    "fuse+channels_last": {"inference_mode": True, "fuse_conv_bn": True, "channels_last": True},
+    "compile": {"inference_mode": True, "compile": True},
+}
+
+
+def build_faster_rcnn(weights: str):
+    model = torchvision.models.detection.fasterrcnn_resnet50_fpn(weights=None, weights_backbone=None)
+    model.roi_heads.box_predictor = FastRCNNPredictor(model.roi_heads.box_predictor.cls_score.in_features, 3)
+    if weights and os.path.exists(weights):
+        model.load_state_dict(torch.load(weights, map_location='cpu'))
+    return model.eval()
+
+
+def build_yolo(weights: str):
+    from ultralytics import YOLO
+    model = YOLO(weights)
+    model.fuse()
+    return model
+
+
+def median_ms(runtime: InferenceRuntime, forward, iterations: int):
+    with runtime.inference_context():
+        # As primeiras chamadas incluem a compilação e a escolha de kernels
+        for _ in range(2):
+            forward()
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            forward()
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--faster-rcnn-weights', default='models/faster_rcnn_model.pth')
+    parser.add_argument('--yolo-weights')
+    parser.add_argument('--threads', type=int, nargs='+', default=[torch.get_num_threads()])
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--size', type=int, default=1024)
+    parser.add_argument('--knobs', nargs='+', default=list(KNOBS), choices=list(KNOBS))
+    args = parser.parse_args()
+
+    device = torch.device('cpu')
+    image = torch.rand(3, args.size, args.size)
+    yolo_input = torch.rand(1, 3, 224, 224)
+
+    print(f"{'model':>12} {'threads':>8} {'knob':>19} {'median ms':>10} {'speedup':>8}")
+    for threads in args.threads:
+        torch.set_num_threads(threads)
+        baselines = {}
+        for knob in args.knobs:
+            runtime = InferenceRuntime(threads=threads, **KNOBS[knob])
+
+            faster_rcnn = runtime.optimize_module(build_faster_rcnn(args.faster_rcnn_weights), device)
+            rows = [("faster_rcnn", median_ms(runtime, lambda: faster_rcnn([image]), args.iterations))]
+
+            if args.yolo_weights:
+                yolo = runtime.optimize_yolo(build_yolo(args.yolo_weights), device)
+                input_tensor = yolo_input.contiguous(memory_format=torch.channels_last) if runtime.channels_last else yolo_input
+                rows.append(("yolo", median_ms(runtime, lambda: yolo.model(input_tensor), args.iterations)))
+
+            for name, elapsed in rows:
+                baselines.setdefault(name, elapsed)
+                print(f"{name:>12} {threads:>8} {knob:>19} {elapsed:>10.1f} {baselines[name] / elapsed:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
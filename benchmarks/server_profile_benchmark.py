@@ -0,0 +1,114 @@
+"""
+Matriz de workers × threads do torch para o perfil de produção do gunicorn.
+
+Para cada combinação sobe a API com gunicorn.conf.py (SERVER_WORKERS e
+TORCH_THREADS fixados), espera o /health/ready e mede a vazão e a latência
+p50/p99 do /predict e do /detect.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.server_profile_benchmark --image exemplo.jpg --workers 1 2 4 --threads 1 2 4
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+from config.server_profile import available_cpus
+
+
+async def wait_until_ready(base_url: str, timeout: float = 600):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{base_url}/health/ready")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(1)
+    raise RuntimeError("API did not become ready in time")
+
+
+async def run_load(base_url: str, path: str, image: bytes, total: int, concurrency: int, headers: dict):
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(timeout=600, headers=headers) as client:
+        async def one_request():
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(f"{base_url}{path}", files={"file": ("image.jpg", image, "image/jpeg")})
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_request() for _ in range(total)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "throughput": total / elapsed,
+        "p50": float(np.percentile(latencies, 50)),
+        "p99": float(np.percentile(latencies, 99)),
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--image', required=True)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--requests', type=int, default=64)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--port', type=int, default=8767)
+    parser.add_argument('--preload-models', default='respiratory,breast_cancer_faster_rcnn')
+    parser.add_argument('--api-key', default=os.getenv('api_key', ''))
+    parser.add_argument('--token', default='')
+    args = parser.parse_args()
+
+    with open(args.image, 'rb') as file:
+        image = file.read()
+
+    headers = {"api_key": args.api_key}
+    if args.token:
+        headers["Authorization"] = f"Bearer {args.token}"
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    print(f"CPUs: {available_cpus()}")
+    print(f"{'workers':>8} {'threads':>8} {'route':>8} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+
+    for workers in args.workers:
+        for threads in args.threads:
+            env = {
+                **os.environ,
+                "SERVER_WORKERS": str(workers),
+                "TORCH_THREADS": str(threads),
+                "SERVER_PORT": str(args.port),
+                "PRELOAD_MODELS": args.preload_models,
+                "INFERENCE_QUEUE_SIZE": str(args.requests),
+            }
+            server = subprocess.Popen(
+                [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"],
+                env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            try:
+                asyncio.run(wait_until_ready(base_url))
+                for path in ('/predict', '/detect'):
+                    result = asyncio.run(run_load(base_url, path, image, args.requests, args.concurrency, headers))
+                    print(f"{workers:>8} {threads:>8} {path:>8} {result['throughput']:>8.2f} "
+                          f"{result['p50']:>9.1f} {result['p99']:>9.1f} {result['errors']:>7}")
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == '__main__':
+    main()
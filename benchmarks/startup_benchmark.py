@@ -0,0 +1,50 @@
+"""
+Mede o tempo de `import main` em interpretadores novos e quantas vezes
+Settings é instanciado (cada instância relê o .env).
+
+Para comparar antes e depois do get_settings/container, rode na revisão
+anterior e na atual:
+    python -m benchmarks.startup_benchmark --runs 10
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import json, time
+import config.settings as config_settings
+constructions = 0
+original_init = config_settings.Settings.__init__
+def counting_init(self, *args, **kwargs):
+    global constructions
+    constructions += 1
+    original_init(self, *args, **kwargs)
+config_settings.Settings.__init__ = counting_init
+start = time.perf_counter()
+import main
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({"import_ms": elapsed, "settings": constructions}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    timings = []
+    constructions = 0
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, '-c', PROBE], capture_output=True, text=True, check=True)
+        result = json.loads(output.stdout.strip().splitlines()[-1])
+        timings.append(result["import_ms"])
+        constructions = result["settings"]
+
+    print(f"import main: median {statistics.median(timings):.1f} ms  min {min(timings):.1f} ms")
+    print(f"Settings constructions during import: {constructions}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Servidor de e-mail falso para testar a outbox localmente.
+
+Responde ao mesmo contrato do serviço de envio (POST /send-email) e pode
+simular lentidão e falhas para exercitar o timeout e o retry do dispatcher:
+    python -m benchmarks.stub_mail_server --port 8025 --fail-rate 0.3 --delay 0.5
+
+E na API:
+    mail_service_url = "http://127.0.0.1:8025/send-email"
+"""
+import argparse
+import asyncio
+import random
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def create_app(fail_rate: float, delay: float):
+    app = FastAPI()
+    app.state.received = []
+
+    @app.post("/send-email")
+    async def send_email(request: Request):
+        payload = await request.json()
+        await asyncio.sleep(delay)
+        if random.random() < fail_rate:
+            print(f"failing email to {payload.get('to')}")
+            return JSONResponse(status_code=503, content={"message": "unavailable"})
+        app.state.received.append(payload)
+        print(f"email #{len(app.state.received)} to {payload.get('to')}: {payload.get('context')}")
+        return {"message": "sent"}
+
+    @app.get("/received")
+    async def received():
+        return app.state.received
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--port', type=int, default=8025)
+    parser.add_argument('--fail-rate', type=float, default=0.0)
+    parser.add_argument('--delay', type=float, default=0.0)
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(args.fail_rate, args.delay), host="127.0.0.1", port=args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Mede a memória por worker do gunicorn com 1, 2, 4 e 8 workers, comparando
+o carregamento privado dos modelos em cada worker com os pesos mapeados em
+memória sem --preload (weights_mmap), com o modo preload-then-fork
+(preload_before_fork) e com os dois combinados.
+
+RSS conta as páginas compartilhadas em todos os processos; PSS divide as
+páginas compartilhadas entre eles e é a métrica que mostra o ganho real.
+
+Uso (Linux, na raiz do projeto):
+    python -m benchmarks.worker_memory_benchmark --workers 1 2 4 8
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+import psutil
+
+MODES = {
+    "private": {"PRELOAD_BEFORE_FORK": "false", "WEIGHTS_MMAP": "false"},
+    "mmap": {"PRELOAD_BEFORE_FORK": "false", "WEIGHTS_MMAP": "true"},
+    "preload": {"PRELOAD_BEFORE_FORK": "true", "WEIGHTS_MMAP": "false"},
+    "preload+mmap": {"PRELOAD_BEFORE_FORK": "true", "WEIGHTS_MMAP": "true"},
+}
+
+
+def wait_until_up(base_url: str, timeout: float = 600):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"{base_url}/")
+            return
+        except httpx.TransportError:
+            time.sleep(1)
+    raise RuntimeError("API did not start in time")
+
+
+def measure(workers: int, env_overrides: dict, port: int, preload_models: str):
+    env = {**os.environ, **env_overrides, "PRELOAD_MODELS": preload_models}
+    command = [
+        sys.executable, "-m", "gunicorn", "main:app",
+        "-k", "uvicorn.workers.UvicornWorker",
+        "-w", str(workers),
+        "-b", f"127.0.0.1:{port}",
+    ]
+    if env_overrides["PRELOAD_BEFORE_FORK"] == "true":
+        command.append("--preload")
+
+    master = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_up(f"http://127.0.0.1:{port}")
+        # Dá tempo para todos os workers terminarem o lifespan
+        time.sleep(5)
+        children = psutil.Process(master.pid).children()
+        infos = [child.memory_full_info() for child in children]
+    finally:
+        master.terminate()
+        master.wait()
+
+    mb = 1024 * 1024
+    return {
+        "rss": sum(info.rss for info in infos) / len(infos) / mb,
+        "pss": sum(info.pss for info in infos) / len(infos) / mb,
+        "total_pss": sum(info.pss for info in infos) / mb,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--preload-models', default='respiratory,breast_cancer_faster_rcnn')
+    args = parser.parse_args()
+
+    print(f"{'mode':>13} {'workers':>8} {'RSS/worker MB':>14} {'PSS/worker MB':>14} {'total PSS MB':>13}")
+    for mode, env_overrides in MODES.items():
+        for workers in args.workers:
+            result = measure(workers, env_overrides, args.port, args.preload_models)
+            print(f"{mode:>13} {workers:>8} {result['rss']:>14.1f} "
+                  f"{result['pss']:>14.1f} {result['total_pss']:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+from functools import lru_cache
+from config.settings import get_settings
+from infra.database import get_pool
+from infra.pronto_database import get_pronto_pool
+from repository.user_repository import UserRepository
+from services.user_service import UserService
+from controllers.user_controller import UserController
+from utils.password_adapter import PasswordAdapter
+from utils.token_adapter import TokenAdapter
+
+
+class Container:
+    def __init__(self):
+        self.settings = get_settings()
+        self.database_pool = get_pool()
+        self.pronto_pool = get_pronto_pool()
+        self.user_repository = UserRepository(self.database_pool, self.pronto_pool)
+        self.password_adapter = PasswordAdapter()
+        self.token_adapter = TokenAdapter()
+        self.user_service = UserService(self.user_repository, self.password_adapter, self.token_adapter)
+        self.user_controller = UserController(self.user_service)
+
+
+@lru_cache
+def get_container() -> Container:
+    return Container()
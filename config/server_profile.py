@@ -0,0 +1,39 @@
+import os
+import psutil
+from config.settings import Settings
+
+
+def available_cpus():
+    # Respeita o cpuset do container quando disponível
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def compute_server_profile(settings: Settings, cpus: int = None, memory_mb: float = None):
+    cpus = cpus or available_cpus()
+    memory_mb = memory_mb or settings.server_memory_budget_mb or psutil.virtual_memory().total * 0.8 / (1024 * 1024)
+
+    # Cada worker carrega os próprios modelos: o orçamento de memória limita
+    # quantos workers cabem, independentemente do número de núcleos
+    max_workers_by_memory = max(1, int(memory_mb // settings.worker_memory_mb))
+
+    # Threads de inferência concorrentes por worker (inference_workers) também
+    # disputam os núcleos, então entram na conta de workers × threads
+    inference_threads = max(1, settings.inference_workers)
+
+    workers = settings.server_workers
+    if workers <= 0:
+        workers = max(1, cpus // (inference_threads * max(1, settings.torch_threads)))
+        workers = min(workers, max_workers_by_memory)
+
+    torch_threads = settings.torch_threads
+    if torch_threads <= 0:
+        torch_threads = max(1, cpus // (workers * inference_threads))
+
+    return {
+        "cpus": cpus,
+        "memory_budget_mb": memory_mb,
+        "workers": workers,
+        "torch_threads": torch_threads
+    }
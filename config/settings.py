@@ -1,3 +1,5 @@
+from functools import lru_cache
+from typing import Literal
 from pydantic_settings import BaseSettings
 
 
@@ -13,6 +15,79 @@ class Settings(BaseSettings):
     EMAIL: str
     EMAIL_PASSWORD: str
     APP_NAME: str
+    inference_workers: int = 1
+    inference_queue_size: int = 4
+    inference_retry_after: int = 5
+    predict_batching_enabled: bool = True
+    predict_max_batch_size: int = 8
+    predict_max_wait_ms: float = 10
+    detect_batching_enabled: bool = True
+    detect_max_batch_size: int = 4
+    detect_max_wait_ms: float = 50
+    respiratory_backend: Literal["torch", "onnx"] = "torch"
+    preload_models: str = ""
+    model_idle_ttl_seconds: float = 0
+    preload_before_fork: bool = False
+    warm_up_iterations: int = 2
+    server_port: int = 8000
+    server_workers: int = 0
+    server_timeout: int = 120
+    server_memory_budget_mb: float = 0
+    worker_memory_mb: float = 1500
+    torch_threads: int = 0
+    torch_interop_threads: int = 0
+    torch_inference_mode: bool = True
+    torch_channels_last: bool = False
+    torch_fuse_conv_bn: bool = False
+    torch_compile: bool = False
+    torch_compile_mode: Literal["default", "reduce-overhead", "max-autotune"] = "default"
+    weights_mmap: bool = False
+    result_store_dir: str = ""
+    result_store_ttl_seconds: float = 300
+    result_cache_enabled: bool = True
+    result_cache_max_bytes: int = 64 * 1024 * 1024
+    result_cache_dir: str = ""
+    result_cache_disk_max_bytes: int = 1024 * 1024 * 1024
+    upload_max_bytes: int = 20 * 1024 * 1024
+    upload_max_pixels: int = 40_000_000
+    batch_max_files: int = 64
+    batch_max_bytes: int = 256 * 1024 * 1024
+    detect_max_dimension: int = 1024
+    detect_resampling: Literal["fast", "balanced", "quality"] = "quality"
+    postgres_pool_min_size: int = 2
+    postgres_pool_max_size: int = 10
+    postgres_pool_timeout: float = 10
+    postgres_pool_max_idle: float = 300
+    pronto_pool_size: int = 4
+    pronto_connection_max_age: float = 300
+    pronto_query_timeout: int = 10
+    pronto_login_timeout: int = 5
+    password_hash_workers: int = 2
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536
+    argon2_parallelism: int = 4
+    token_cache_size: int = 1024
+    mail_service_url: str = "https://simple-mail-compose-simple-mail.o3luz9.easypanel.host/send-email"
+    mail_timeout_seconds: float = 10
+    email_max_attempts: int = 5
+    email_retry_base_seconds: float = 5
+    email_retry_max_seconds: float = 300
+    email_dispatch_interval_seconds: float = 5
+    job_workers: int = 1
+    job_max_attempts: int = 3
+    job_lease_seconds: float = 600
+    job_result_ttl_seconds: float = 3600
+    job_poll_interval_seconds: float = 1
+    job_max_wait_seconds: float = 30
+    job_cleanup_interval_seconds: float = 60
 
     class Config:
-        env_file = ".env"
\ No newline at end of file
+        env_file = ".env"
+        # Libera o prefixo model_ (model_idle_ttl_seconds) reservado pelo pydantic
+        protected_namespaces = ("settings_",)
+
+
+@lru_cache
+def get_settings() -> Settings:
+    # Uma única leitura do .env por processo
+    return Settings()
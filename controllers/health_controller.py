@@ -0,0 +1,12 @@
+from fastapi.responses import JSONResponse
+from services.warm_up_service import model_warm_up
+
+
+async def handle_live():
+    return {"status": "alive"}
+
+
+async def handle_ready():
+    status = model_warm_up.status()
+    # 503 enquanto os modelos não estiverem aquecidos tira o worker do balanceador
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
@@ -0,0 +1,52 @@
+import base64
+from fastapi import UploadFile, HTTPException, Request
+from fastapi.responses import JSONResponse
+from config.settings import get_settings
+from services.detection_job_service import detection_job_service
+from utils.upload_reader import read_image_upload
+
+settings = get_settings()
+
+
+def _job_content(job: dict):
+    content = {
+        "job_id": job["id"],
+        "status": job["status"],
+        "attempts": job["attempts"],
+        "created_at": job["created_at"].isoformat(),
+        "finished_at": job["finished_at"].isoformat() if job["finished_at"] else None
+    }
+    if job["status"] == "done":
+        content["detections"] = job["result"]["detections"]
+        if job["result_image"] is not None:
+            content["image"] = base64.b64encode(job["result_image"]).decode('utf-8')
+    if job["status"] == "failed":
+        content["error"] = job["error"]
+    return content
+
+
+async def handle_submit_detect(request: Request, file: UploadFile, output: str = "json"):
+    image_data = await read_image_upload(file)
+
+    claims = getattr(request.state, 'claims', {}) or {}
+    job_id = await detection_job_service.submit(image_data, output != "detections", claims.get('user_id'))
+
+    return JSONResponse(
+        status_code=202,
+        content={
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": f"/jobs/{job_id}"
+        },
+        headers={"Location": f"/jobs/{job_id}"}
+    )
+
+async def handle_get_job(request: Request, job_id: str, wait: float = 0):
+    job = await detection_job_service.get(job_id, min(max(wait, 0), settings.job_max_wait_seconds))
+
+    claims = getattr(request.state, 'claims', {}) or {}
+    # Cada usuário só enxerga os próprios jobs; administradores enxergam todos
+    if job is None or (claims.get('profile') != 'Administrador' and job["user_id"] != claims.get('user_id')):
+        raise HTTPException(status_code=404, detail="Job não encontrado ou expirado.")
+
+    return JSONResponse(content=_job_content(job))
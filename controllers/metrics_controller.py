@@ -0,0 +1,5 @@
+from utils.metrics import metrics
+
+
+async def handle_metrics():
+    return metrics.snapshot()
@@ -1,21 +1,96 @@
-from fastapi import UploadFile
+from typing import Optional
+from fastapi import UploadFile, HTTPException
+from config.settings import get_settings
 from services import prediction_service
-from fastapi.responses import JSONResponse
+from services.prediction_batching import predict_batcher, detect_batcher
+from utils.inference_executor import inference_executor
+from utils.multipart_response import build_multipart_mixed
+from utils.result_store import result_store
+from utils.upload_reader import read_image_upload, read_batch_upload
+from utils.result_cache import predict_cache, detect_cache, file_fingerprint
+from models.model import RESPIRATORY_WEIGHTS, FASTER_RCNN_WEIGHTS
+from fastapi.responses import JSONResponse, Response, FileResponse
+import asyncio
 import base64
+import json
 import io
 
+settings = get_settings()
 
-async def handle_prediction(file: UploadFile):
-    image = await file.read()
-    
-    prediction = prediction_service.predict_image(image)
+
+def _cache_policy(cache_control: Optional[str]):
+    # "Cache-Control: no-cache" força uma nova inferência (e atualiza o cache);
+    # "no-store" também impede que o resultado seja guardado
+    directives = {directive.strip().lower() for directive in (cache_control or '').split(',')}
+    read = settings.result_cache_enabled and not directives & {'no-cache', 'no-store'}
+    write = settings.result_cache_enabled and 'no-store' not in directives
+    return read, write
+
+
+# As funções de consulta ao cache rodam em uma thread: o SHA-256 de uploads
+# grandes e a leitura do diretório em disco bloqueariam o event loop
+def _predict_lookup(image: bytes, read_cache: bool):
+    cache_key = predict_cache.make_key(image, file_fingerprint(RESPIRATORY_WEIGHTS), settings.respiratory_backend)
+    return cache_key, predict_cache.get(cache_key) if read_cache else None
+
+
+def _detect_lookup(image_data: bytes, annotate: bool, read_cache: bool):
+    cache_key = detect_cache.make_key(
+        image_data, file_fingerprint(FASTER_RCNN_WEIGHTS),
+        prediction_service.SCORE_THRESHOLD, prediction_service.NMS_THRESHOLD,
+        settings.detect_max_dimension, settings.detect_resampling, annotate
+    )
+    return cache_key, detect_cache.get(cache_key) if read_cache else None
+
+
+async def _run_in_chunks(func, items: list, chunk_size: int, *args):
+    # Cada bloco é uma única passagem do modelo; uma falha no bloco inteiro
+    # vira erro apenas para os arquivos daquele bloco
+    results = []
+    for start in range(0, len(items), chunk_size):
+        chunk = items[start:start + chunk_size]
+        try:
+            results.extend(await inference_executor.run(func, chunk, *[arg[start:start + chunk_size] for arg in args]))
+        except HTTPException as exc:
+            if exc.status_code == 503:
+                raise
+            results.extend([exc] * len(chunk))
+        except Exception as exc:
+            results.extend([exc] * len(chunk))
+    return results
+
+
+def _batch_error(filename: str, exc: Exception):
+    if not isinstance(exc, HTTPException):
+        exc = HTTPException(status_code=500, detail="An error occurred while processing the image. Please try again later.")
+    return {"filename": filename, "error": {"status_code": exc.status_code, "detail": exc.detail}}
+
+
+def _batch_response(results: list):
+    failed = sum(1 for result in results if "error" in result)
+    return {"total": len(results), "succeeded": len(results) - failed, "failed": failed, "results": results}
+
+
+async def handle_prediction(file: UploadFile, cache_control: Optional[str] = None):
+    image = await read_image_upload(file)
+
+    read_cache, write_cache = _cache_policy(cache_control)
+    cache_key, prediction = await asyncio.to_thread(_predict_lookup, image, read_cache)
+
+    if prediction is None:
+        if settings.predict_batching_enabled:
+            prediction = await predict_batcher.submit(image)
+        else:
+            prediction = await inference_executor.run(prediction_service.predict_image, image)
+        if write_cache:
+            await predict_cache.put_async(cache_key, prediction)
     
     return {"prediction": prediction}
 
 async def handle_detect_breast_cancer(file: UploadFile):
-    image_data = await file.read()
+    image_data = await read_image_upload(file)
     
-    result = prediction_service.detect_breast_cancer(image_data)
+    result = await inference_executor.run(prediction_service.detect_breast_cancer, image_data)
     
     image_base64 = base64.b64encode(result["image"]).decode('utf-8')
     
@@ -24,10 +99,45 @@ async def handle_detect_breast_cancer(file: UploadFile):
         "image": image_base64
     })
 
-async def handle_detect_breast_cancer_with_fastRCNN(file: UploadFile):
-    image_data = await file.read()
-    
-    result = prediction_service.detect_breast_cancer_with_fastRCNN(image_data)
+async def handle_detect_breast_cancer_with_fastRCNN(file: UploadFile, output: str = "json", cache_control: Optional[str] = None):
+    image_data = await read_image_upload(file)
+
+    annotate = output != "detections"
+
+    read_cache, write_cache = _cache_policy(cache_control)
+    cache_key, result = await asyncio.to_thread(_detect_lookup, image_data, annotate, read_cache)
+
+    if result is None:
+        if settings.detect_batching_enabled:
+            result = await detect_batcher.submit((image_data, annotate))
+        else:
+            result = await inference_executor.run(prediction_service.detect_breast_cancer_with_fastRCNN, image_data, annotate)
+        if write_cache:
+            await detect_cache.put_async(cache_key, result)
+
+    if output == "detections":
+        return JSONResponse(content={
+            "detections": result["detections"]
+        })
+
+    if output == "image":
+        return Response(
+            content=result["image"],
+            media_type="image/jpeg",
+            headers={"X-Detections": json.dumps(result["detections"])}
+        )
+
+    if output == "multipart":
+        body, content_type = build_multipart_mixed(result["detections"], result["image"])
+        return Response(content=body, media_type=content_type)
+
+    if output == "url":
+        result_id = await asyncio.to_thread(result_store.put, result["image"])
+        return JSONResponse(content={
+            "detections": result["detections"],
+            "image_url": f"/detect/result/{result_id}",
+            "expires_in": settings.result_store_ttl_seconds
+        })
     
     image_base64 = base64.b64encode(result["image"]).decode('utf-8')
     
@@ -35,3 +145,89 @@ async def handle_detect_breast_cancer_with_fastRCNN(file: UploadFile):
         "detections": result["detections"],
         "image": image_base64
     })
+
+async def handle_prediction_batch(files: list, cache_control: Optional[str] = None):
+    entries = await read_batch_upload(files)
+
+    read_cache, write_cache = _cache_policy(cache_control)
+    results = [None] * len(entries)
+    pending = []
+
+    for index, (filename, image) in enumerate(entries):
+        if isinstance(image, HTTPException):
+            results[index] = _batch_error(filename, image)
+            continue
+        cache_key, prediction = await asyncio.to_thread(_predict_lookup, image, read_cache)
+        if prediction is not None:
+            results[index] = {"filename": filename, "prediction": prediction}
+        else:
+            pending.append((index, image, cache_key))
+
+    predictions = await _run_in_chunks(prediction_service.predict_images, [image for _, image, _ in pending], settings.predict_max_batch_size)
+
+    for (index, _, cache_key), prediction in zip(pending, predictions):
+        filename = entries[index][0]
+        if isinstance(prediction, Exception):
+            results[index] = _batch_error(filename, prediction)
+            continue
+        if write_cache:
+            await predict_cache.put_async(cache_key, prediction)
+        results[index] = {"filename": filename, "prediction": prediction}
+
+    return _batch_response(results)
+
+async def handle_detect_batch(files: list, output: str = "detections", cache_control: Optional[str] = None):
+    entries = await read_batch_upload(files)
+
+    # Em lote só são devolvidas as detecções ou a URL da imagem anotada
+    annotate = output == "url"
+    read_cache, write_cache = _cache_policy(cache_control)
+    results = [None] * len(entries)
+    pending = []
+
+    for index, (filename, image_data) in enumerate(entries):
+        if isinstance(image_data, HTTPException):
+            results[index] = _batch_error(filename, image_data)
+            continue
+        cache_key, result = await asyncio.to_thread(_detect_lookup, image_data, annotate, read_cache)
+        if result is not None:
+            results[index] = (filename, result)
+        else:
+            pending.append((index, image_data, cache_key))
+
+    detections = await _run_in_chunks(
+        prediction_service.detect_breast_cancer_with_fastRCNN_batch,
+        [image_data for _, image_data, _ in pending],
+        settings.detect_max_batch_size,
+        [annotate] * len(pending)
+    )
+
+    for (index, _, cache_key), result in zip(pending, detections):
+        filename = entries[index][0]
+        if isinstance(result, Exception):
+            results[index] = _batch_error(filename, result)
+            continue
+        if write_cache:
+            await detect_cache.put_async(cache_key, result)
+        results[index] = (filename, result)
+
+    for index, result in enumerate(results):
+        if isinstance(result, tuple):
+            filename, result = result
+            results[index] = {"filename": filename, "detections": result["detections"]}
+            if annotate:
+                result_id = await asyncio.to_thread(result_store.put, result["image"])
+                results[index]["image_url"] = f"/detect/result/{result_id}"
+
+    response = _batch_response(results)
+    if annotate:
+        response["expires_in"] = settings.result_store_ttl_seconds
+    return response
+
+async def handle_detect_result(result_id: str):
+    path = result_store.get_path(result_id)
+
+    if not path:
+        raise HTTPException(status_code=404, detail="Resultado não encontrado ou expirado.")
+
+    return FileResponse(path, media_type="image/jpeg")
@@ -1,4 +1,3 @@
-from fastapi import Request
 from interfaces.create_user import CreateUser
 from interfaces.user_login import UserLogin
 from services.user_service import UserService
@@ -9,71 +8,54 @@ from interfaces.update_password_user_common import UpdatePasswordUserCommon
 from interfaces.forgot_update_password_model import ForgotUpadatePassword
 from interfaces.code_verification_model import CodeVerification
 from interfaces.id_verification_model import IdVerification
-from interfaces.user_pronto import UserLoginPronto  
-from utils import credentials_middleware
+from interfaces.user_pronto import UserLoginPronto
 
 
 class UserController:
-    def __init__(self):
-        self.user_service = UserService()
-        self.credentials_middleware = credentials_middleware.CredentialsMiddleware()
+    def __init__(self, user_service: UserService = None):
+        self.user_service = user_service or UserService()
 
-    async def create_user(self, request: Request, user: CreateUser):
-        await self.credentials_middleware.verify_credentials(request)
+    async def create_user(self, user: CreateUser):
         return await self.user_service.create_user(user)
     
-    async def login_user(self, request: Request, user: UserLogin):
-        await self.credentials_middleware.verify_credentials(request)
+    async def login_user(self, user: UserLogin):
         return await self.user_service.login_user(user)
     
-    async def login_user_pronto(self, request: Request, user: UserLoginPronto):
-        await self.credentials_middleware.verify_credentials(request)
+    async def login_user_pronto(self, user: UserLoginPronto):
         return await self.user_service.login_user_pronto(user)
     
-    async def get_user_by_id(self, request: Request, id: str):
-        await self.credentials_middleware.verify_credentials(request)
+    async def get_user_by_id(self, id: str):
         return await self.user_service.get_user_by_id(id)
     
-    async def get_users(self, request: Request):
-        await self.credentials_middleware.verify_credentials(request)
+    async def get_users(self):
         return await self.user_service.get_users()
     
-    async def update_user(self, request: Request, id: str, user: UpdateUser):
-        await self.credentials_middleware.verify_credentials(request)
+    async def update_user(self, id: str, user: UpdateUser):
         return await self.user_service.update_user(id, user)
     
-    async def update_password(self, request: Request, user: UpdatePassword):
-        await self.credentials_middleware.verify_credentials(request)
+    async def update_password(self, user: UpdatePassword):
         return await self.user_service.update_password(user)
     
-    async def update_password_user_common(self, request: Request, id: str, user: UpdatePasswordUserCommon):
-        await self.credentials_middleware.verify_credentials(request)
+    async def update_password_user_common(self, id: str, user: UpdatePasswordUserCommon):
         return await self.user_service.update_password_user_common(id, user)
     
-    async def send_verification_code(self, request: Request, email: str):
-        await self.credentials_middleware.verify_credentials(request)
+    async def send_verification_code(self, email: str):
         return await self.user_service.send_verification_code(email)
     
-    async def resend_verification_code(self, request: Request, email: str, id_verification: IdVerification):
-        await self.credentials_middleware.verify_credentials(request)
+    async def resend_verification_code(self, email: str, id_verification: IdVerification):
         return await self.user_service.resend_verification_code(email, id_verification)
     
-    async def confirm_code_verification(self, request: Request, email: str, code_verification: CodeVerification):
-        await self.credentials_middleware.verify_credentials(request)
+    async def confirm_code_verification(self, email: str, code_verification: CodeVerification):
         return await self.user_service.confirm_code_verification(email, code_verification)
     
-    async def forgot_update_password(self, request: Request, user_id: str, new_password: ForgotUpadatePassword):
-        await self.credentials_middleware.verify_credentials(request)
+    async def forgot_update_password(self, user_id: str, new_password: ForgotUpadatePassword):
         return await self.user_service.forgot_update_password(user_id, new_password)
     
-    async def delete_user(self, request: Request, id: str):
-        await self.credentials_middleware.verify_credentials(request)
+    async def delete_user(self, id: str):
         return await self.user_service.delete_user(id)
     
-    async def create_feedback(self, request: Request, feedback: CreateFeedbackUser):
-        await self.credentials_middleware.verify_credentials(request)
+    async def create_feedback(self, feedback: CreateFeedbackUser):
         return await self.user_service.create_feedback(feedback)
     
-    async def get_feedback(self, request: Request):
-        await self.credentials_middleware.verify_credentials(request)
+    async def get_feedback(self):
         return await self.user_service.get_feedback()
@@ -0,0 +1,40 @@
+import os
+from config.settings import get_settings
+from config.server_profile import compute_server_profile
+from utils.logger import get_logger
+
+logger = get_logger('gunicorn.conf')
+
+settings = get_settings()
+
+profile = compute_server_profile(settings)
+
+# Limita as bibliotecas nativas antes de qualquer worker importar o torch,
+# para que workers × threads não ultrapasse o número de núcleos
+for variable in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+    os.environ.setdefault(variable, str(profile["torch_threads"]))
+os.environ["TORCH_THREADS"] = str(profile["torch_threads"])
+# As configurações lidas acima ficariam em cache e seriam herdadas pelos
+# workers no fork, sem o TORCH_THREADS calculado
+get_settings.cache_clear()
+
+bind = f"0.0.0.0:{settings.server_port}"
+worker_class = 'uvicorn.workers.UvicornWorker'
+workers = profile["workers"]
+preload_app = settings.preload_before_fork
+# Uma inferência do Faster R-CNN em CPU pode passar do timeout padrão de 30 s
+timeout = settings.server_timeout
+graceful_timeout = settings.server_timeout
+keepalive = 5
+
+
+def on_starting(server):
+    logger.info(f'Server profile: {profile["workers"]} workers x {profile["torch_threads"]} torch threads '
+                f'({profile["cpus"]} CPUs, {profile["memory_budget_mb"]:.0f} MB budget)')
+
+
+def post_fork(server, worker):
+    # Com preload_app o torch já foi importado no mestre, então as threads são
+    # reconfiguradas em cada worker depois do fork
+    import torch
+    torch.set_num_threads(profile["torch_threads"])
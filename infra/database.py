@@ -1,5 +1,46 @@
-from config.settings import Settings
+from psycopg_pool import AsyncConnectionPool
+from config.settings import get_settings
+from utils.metrics import metrics
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_pool = None
+
+# Chave fixa do advisory lock que serializa a criação das tabelas: vários
+# workers subindo juntos com CREATE ... IF NOT EXISTS podem colidir no catálogo
+SCHEMA_LOCK_KEY = 4827361
 
 def get_database():
-    settings = Settings()
-    return settings.postgres_url
\ No newline at end of file
+    settings = get_settings()
+    return settings.postgres_url
+
+def get_pool() -> AsyncConnectionPool:
+    global _pool
+    if _pool is None:
+        settings = get_settings()
+        _pool = AsyncConnectionPool(
+            conninfo=get_database(),
+            min_size=settings.postgres_pool_min_size,
+            max_size=settings.postgres_pool_max_size,
+            timeout=settings.postgres_pool_timeout,
+            max_idle=settings.postgres_pool_max_idle,
+            # Valida a conexão antes de entregá-la, descartando as que caíram
+            check=AsyncConnectionPool.check_connection,
+            open=False,
+        )
+        metrics.register_collector('postgres_pool', _pool.get_stats)
+    return _pool
+
+async def open_pool():
+    # Sem esperar as conexões: com o Postgres fora do ar o worker ainda sobe e
+    # as rotas de inferência continuam respondendo; o pool segue tentando
+    # conectar em segundo plano
+    try:
+        await get_pool().open(wait=False)
+    except Exception as e:
+        logger.error(f'Error opening Postgres pool: {e}')
+
+async def close_pool():
+    if _pool is not None:
+        await _pool.close()
@@ -0,0 +1,113 @@
+import asyncio
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pymssql
+from config.settings import Settings, get_settings
+from utils.metrics import metrics
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_pool = None
+
+
+class ProntoConnectionPool:
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.max_size = settings.pronto_pool_size
+        self.max_age_seconds = settings.pronto_connection_max_age
+        self.query_timeout = settings.pronto_query_timeout
+        self.login_timeout = settings.pronto_login_timeout
+        self._idle = queue.LifoQueue(maxsize=self.max_size)
+        # Cada thread usa uma conexão por vez, então o executor limita o
+        # número de conexões abertas ao tamanho do pool
+        self._executor = ThreadPoolExecutor(max_workers=self.max_size, thread_name_prefix='pronto')
+
+    async def run(self, func):
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._executor, self._run, func),
+                timeout=self.login_timeout + self.query_timeout
+            )
+        except asyncio.TimeoutError:
+            metrics.increment('pronto_timeouts_total')
+            raise
+        finally:
+            metrics.observe('pronto_query_ms', (time.perf_counter() - start) * 1000)
+
+    def stats(self):
+        return {
+            "max_size": self.max_size,
+            "idle_connections": self._idle.qsize()
+        }
+
+    def close(self):
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._close(connection)
+        self._executor.shutdown(wait=False)
+
+    def _run(self, func):
+        connection, created_at = self._acquire()
+        try:
+            result = func(connection)
+        except Exception:
+            # Conexão possivelmente quebrada: não volta para o pool
+            self._close(connection)
+            raise
+        self._release(connection, created_at)
+        return result
+
+    def _acquire(self):
+        while True:
+            try:
+                connection, created_at = self._idle.get_nowait()
+            except queue.Empty:
+                metrics.increment('pronto_connections_opened_total')
+                return self._connect(), time.monotonic()
+
+            if time.monotonic() - created_at <= self.max_age_seconds:
+                return connection, created_at
+            self._close(connection)
+
+    def _release(self, connection, created_at):
+        try:
+            self._idle.put_nowait((connection, created_at))
+        except queue.Full:
+            self._close(connection)
+
+    def _connect(self):
+        return pymssql.connect(
+            server=self.settings.server,
+            port=self.settings.port,
+            user=self.settings.user_pronto,
+            password=self.settings.password,
+            database=self.settings.database,
+            timeout=self.query_timeout,
+            login_timeout=self.login_timeout,
+        )
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.close()
+        except Exception as e:
+            logger.error(f'Error closing Pronto connection: {e}')
+
+
+def get_pronto_pool() -> ProntoConnectionPool:
+    global _pool
+    if _pool is None:
+        _pool = ProntoConnectionPool(get_settings())
+        metrics.register_collector('pronto_pool', _pool.stats)
+    return _pool
+
+def close_pronto_pool():
+    if _pool is not None:
+        _pool.close()
@@ -1,13 +1,85 @@
+import time
+
+startup_started_at = time.perf_counter()
+
+import gc
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
 from routes.prediction_route import router as prediction_route
 from routes.user_route import router as user_route
+from routes.metrics_route import router as metrics_route
+from routes.health_route import router as health_route
+from routes.job_route import router as job_route
 from utils import custom_openapi
+from utils.credentials_middleware import AuthenticationMiddleware
+from utils.body_size_limit import BodySizeLimitMiddleware
+from config.settings import get_settings
+from models.model_registry import model_registry
+from services.warm_up_service import model_warm_up
+from utils.inference_executor import inference_executor
+from infra.database import open_pool, close_pool
+from infra.pronto_database import close_pronto_pool
+from utils.password_adapter import shutdown_password_executor
+from utils.email_dispatcher import email_dispatcher
+from services.detection_job_service import detection_job_service
+from utils.logger import get_logger
+from config.container import get_container
 
 load_dotenv()
 
-app = FastAPI()
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+# Repositórios, adaptadores e pools são montados uma única vez por processo
+container = get_container()
+
+preload_models = [name.strip() for name in settings.preload_models.split(',') if name.strip()]
+
+if settings.preload_before_fork:
+    # Com `gunicorn --preload` este módulo é importado no processo mestre: os
+    # modelos carregados aqui são herdados pelos workers via copy-on-write
+    model_registry.warm_up(preload_models, pin=True)
+    gc.freeze()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # O aquecimento termina antes do yield: um worker só aceita conexões depois
+    # do lifespan, então com vários workers na mesma porta o balanceador nunca
+    # recebe resposta de um worker frio. Passa pelo executor de inferência para
+    # contar no mesmo limite das requisições
+    await inference_executor.run(model_warm_up.run, preload_models)
+    model_registry.start_idle_reaper()
+    await open_pool()
+    await email_dispatcher.start()
+    await detection_job_service.start()
+    logger.info(f'Startup completed in {(time.perf_counter() - startup_started_at) * 1000:.0f} ms')
+    yield
+    await detection_job_service.stop()
+    await email_dispatcher.stop()
+    await close_pool()
+    close_pronto_pool()
+    shutdown_password_executor()
+    model_registry.stop_idle_reaper()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Folga para os cabeçalhos e delimitadores do multipart além do arquivo
+app.add_middleware(BodySizeLimitMiddleware, limits=(
+    ('/predict/batch', settings.batch_max_bytes + 64 * 1024),
+    ('/detect/batch', settings.batch_max_bytes + 64 * 1024),
+    ('/predict', settings.upload_max_bytes + 64 * 1024),
+    ('/detect', settings.upload_max_bytes + 64 * 1024),
+    ('/jobs/detect', settings.upload_max_bytes + 64 * 1024)
+))
+
+# Adicionado antes do CORS para que o CORS fique na camada externa e
+# também responda às requisições rejeitadas na autenticação
+app.add_middleware(AuthenticationMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -21,6 +93,9 @@ app.openapi = lambda: custom_openapi.custom_openapi(app)
 
 app.include_router(prediction_route, tags=["prediction"])
 app.include_router(user_route, tags=["user"])
+app.include_router(metrics_route, tags=["metrics"])
+app.include_router(job_route, tags=["jobs"])
+app.include_router(health_route, tags=["health"])
 
 @app.get("/")
 def read_root():
@@ -2,14 +2,37 @@ from ultralytics import YOLO
 import torch
 import torchvision
 from torchvision.models.detection.faster_rcnn import FastRCNNPredictor
+from config.settings import get_settings
+from models.runtime import inference_runtime
+
+settings = get_settings()
+
+RESPIRATORY_WEIGHTS = 'models/best.pt'
+BREAST_CANCER_WEIGHTS = 'models/best_breast_cancer.pt'
+FASTER_RCNN_WEIGHTS = 'models/faster_rcnn_model.pth'
+
+device = torch.device('cuda') if torch.cuda.is_available() else torch.device('cpu')
+
+# Threads definidas pelo gunicorn.conf.py para cada worker (ou pelo .env)
+inference_runtime.configure_threads()
 
 def load_model():
-    model = YOLO('models/best.pt')
-    return model
+    if settings.respiratory_backend == 'onnx':
+        # Sessão do onnxruntime em CPU, exportada do best.pt na primeira carga;
+        # importada aqui para que o backend torch não dependa do onnxruntime
+        from models.onnx_backend import load_onnx_classifier
+        return load_onnx_classifier(RESPIRATORY_WEIGHTS, inference_runtime.threads)
+
+    model = YOLO(RESPIRATORY_WEIGHTS)
+    # Funde conv+bn já no carregamento para que a primeira predição não
+    # recrie os pesos (e quebre o compartilhamento copy-on-write entre workers)
+    model.fuse()
+    return inference_runtime.optimize_yolo(model, device)
 
 def load_model_breast_cancer():
-    model = YOLO('models/best_breast_cancer.pt')
-    return model
+    model = YOLO(BREAST_CANCER_WEIGHTS)
+    model.fuse()
+    return inference_runtime.optimize_yolo(model, device)
 
 def load_model_breast_cancer_with_fatRCNN(device):
     num_classes = 3  
@@ -22,9 +45,15 @@ def load_model_breast_cancer_with_fatRCNN(device):
     # Substitui o preditor por um novo com o número de classes desejado
     model.roi_heads.box_predictor = FastRCNNPredictor(in_features, num_classes)
 
-    model.load_state_dict(torch.load('models/faster_rcnn_model.pth', map_location=device))
+    if settings.weights_mmap and device.type == 'cpu':
+        # Mapeia o arquivo de pesos em memória: as páginas ficam no page cache
+        # e são compartilhadas por todos os workers que carregam o mesmo arquivo
+        state_dict = torch.load(FASTER_RCNN_WEIGHTS, map_location=device, mmap=True, weights_only=True)
+        model.load_state_dict(state_dict, assign=True)
+    else:
+        model.load_state_dict(torch.load(FASTER_RCNN_WEIGHTS, map_location=device))
 
     model.to(device)
     model.eval()
 
-    return model
+    return inference_runtime.optimize_module(model, device)
@@ -0,0 +1,130 @@
+import gc
+import threading
+import time
+import psutil
+from config.settings import get_settings
+from models.model import load_model, load_model_breast_cancer, load_model_breast_cancer_with_fatRCNN, device
+from utils.metrics import metrics
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+
+class ModelRegistry:
+    def __init__(self, idle_ttl_seconds: float = 0):
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self._loaders = {}
+        self._models = {}
+        self._stats = {}
+        self._locks = {}
+        self._pinned = set()
+        self._reaper = None
+        self._stop_reaper = threading.Event()
+
+    def register(self, name: str, loader):
+        self._loaders[name] = loader
+        self._locks[name] = threading.Lock()
+        self._stats[name] = {
+            "loaded": False,
+            "load_count": 0,
+            "load_time_ms": None,
+            "resident_memory_mb": None,
+            "last_used_at": None
+        }
+
+    def get(self, name: str):
+        if name not in self._loaders:
+            raise KeyError(f'Model {name} is not registered')
+
+        model = self._models.get(name)
+        if model is None:
+            with self._locks[name]:
+                model = self._models.get(name)
+                if model is None:
+                    model = self._load(name)
+
+        self._stats[name]["last_used_at"] = time.monotonic()
+        return model
+
+    def warm_up(self, names=None, pin: bool = False):
+        for name in self._loaders if names is None else names:
+            self.get(name)
+            if pin:
+                self._pinned.add(name)
+
+    def unload(self, name: str):
+        with self._locks[name]:
+            if self._models.pop(name, None) is not None:
+                self._stats[name]["loaded"] = False
+                gc.collect()
+                logger.info(f'Model {name} unloaded')
+
+    def unload_idle(self):
+        if self.idle_ttl_seconds <= 0:
+            return
+        now = time.monotonic()
+        for name, stats in self._stats.items():
+            if name in self._pinned:
+                continue
+            # last_used_at é None enquanto o modelo ainda não terminou de carregar
+            if stats["loaded"] and stats["last_used_at"] is not None \
+                    and now - stats["last_used_at"] > self.idle_ttl_seconds:
+                self.unload(name)
+
+    def start_idle_reaper(self, interval_seconds: float = 60):
+        if self.idle_ttl_seconds <= 0 or self._reaper is not None:
+            return
+
+        def reap():
+            while not self._stop_reaper.wait(interval_seconds):
+                self.unload_idle()
+
+        self._reaper = threading.Thread(target=reap, name='model-idle-reaper', daemon=True)
+        self._reaper.start()
+
+    def stop_idle_reaper(self):
+        self._stop_reaper.set()
+
+    def stats(self):
+        now = time.monotonic()
+        return {
+            name: {
+                **{key: value for key, value in stats.items() if key != "last_used_at"},
+                "idle_seconds": now - stats["last_used_at"] if stats["last_used_at"] else None
+            } for name, stats in self._stats.items()
+        }
+
+    def _load(self, name: str):
+        process = psutil.Process()
+        rss_before = process.memory_info().rss
+        start = time.perf_counter()
+
+        model = self._loaders[name]()
+
+        load_time_ms = (time.perf_counter() - start) * 1000
+        # Aproximação da memória residente do modelo pela variação do RSS do processo
+        resident_memory_mb = max(0, process.memory_info().rss - rss_before) / (1024 * 1024)
+
+        self._models[name] = model
+        self._stats[name].update({
+            "loaded": True,
+            "load_count": self._stats[name]["load_count"] + 1,
+            "load_time_ms": load_time_ms,
+            "resident_memory_mb": resident_memory_mb,
+            # Definido junto com loaded para que o reaper nunca veja o modelo
+            # carregado com o last_used_at de antes de um descarregamento
+            "last_used_at": time.monotonic()
+        })
+        metrics.observe('model_load_ms', load_time_ms)
+        logger.info(f'Model {name} loaded in {load_time_ms:.0f} ms ({resident_memory_mb:.1f} MB)')
+        return model
+
+
+model_registry = ModelRegistry(idle_ttl_seconds=settings.model_idle_ttl_seconds)
+model_registry.register('respiratory', load_model)
+model_registry.register('breast_cancer', load_model_breast_cancer)
+model_registry.register('breast_cancer_faster_rcnn', lambda: load_model_breast_cancer_with_fatRCNN(device))
+
+metrics.register_collector('models', model_registry.stats)
@@ -0,0 +1,109 @@
+import ast
+import fcntl
+import os
+import shutil
+import tempfile
+import numpy as np
+import onnxruntime as ort
+from PIL import Image
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class OnnxProbs:
+    # Subconjunto do Probs do ultralytics usado por probs_to_dictionary,
+    # sobre um array numpy (sem importar torch)
+    def __init__(self, data: np.ndarray):
+        self.data = data
+
+    @property
+    def top5(self):
+        return (-self.data).argsort(0)[:5].tolist()
+
+
+class OnnxClassification:
+    # Mesmos atributos usados de um Results do ultralytics (probs e names),
+    # para que predict_image e probs_to_dictionary não mudem com o backend
+    def __init__(self, probs: np.ndarray, names: dict):
+        self.probs = OnnxProbs(probs)
+        self.names = names
+
+
+def export_onnx(weights: str) -> str:
+    onnx_path = os.path.splitext(weights)[0] + '.onnx'
+
+    # Vários workers podem subir ao mesmo tempo: o lock garante uma única
+    # exportação, e as demais reaproveitam o arquivo gerado
+    with open(onnx_path + '.lock', 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        if not os.path.exists(onnx_path) or os.path.getmtime(onnx_path) < os.path.getmtime(weights):
+            logger.info(f'Exporting {weights} to ONNX')
+            # O ultralytics só é necessário para exportar; a sessão do
+            # onnxruntime não depende dele nem do torch
+            from ultralytics import YOLO
+
+            # O ultralytics grava o .onnx ao lado do .pt, com os nomes das
+            # classes e o imgsz do treino nos metadados do modelo. A exportação
+            # é feita em um diretório temporário e só substitui o arquivo final
+            # quando termina, para que um worker morto no meio não deixe um
+            # .onnx parcial mais novo que o .pt
+            export_dir = tempfile.mkdtemp(prefix='.onnx-export-', dir=os.path.dirname(onnx_path) or '.')
+            try:
+                temp_weights = shutil.copy2(weights, export_dir)
+                exported = YOLO(temp_weights).export(format='onnx', dynamic=True, simplify=False)
+                os.replace(exported, onnx_path)
+            finally:
+                shutil.rmtree(export_dir, ignore_errors=True)
+
+    return onnx_path
+
+
+def classify_preprocess(image: Image.Image, size: int) -> np.ndarray:
+    # Mesmo resultado do classify_transforms do ultralytics (Resize do menor
+    # lado, CenterCrop, ToTensor; média 0 e desvio 1), feito com PIL e numpy
+    image = image.convert('RGB')
+    width, height = image.size
+    if width <= height:
+        resized = (size, int(size * height / width))
+    else:
+        resized = (int(size * width / height), size)
+    if resized != image.size:
+        image = image.resize(resized, Image.BILINEAR)
+
+    left = int(round((resized[0] - size) / 2.0))
+    top = int(round((resized[1] - size) / 2.0))
+    image = image.crop((left, top, left + size, top + size))
+
+    return np.asarray(image, dtype=np.float32).transpose(2, 0, 1) / 255.0
+
+
+class OnnxClassifier:
+    def __init__(self, onnx_path: str, threads: int = 0):
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+
+        self.session = ort.InferenceSession(onnx_path, options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        self.names = ast.literal_eval(metadata['names'])
+        imgsz = ast.literal_eval(metadata['imgsz'])
+        self.imgsz = imgsz[0] if isinstance(imgsz, (list, tuple)) else imgsz
+
+    def __call__(self, images):
+        if not isinstance(images, list):
+            images = [images]
+
+        batch = np.stack([classify_preprocess(image, self.imgsz) for image in images])
+        # A cabeça Classify exportada já devolve as probabilidades (softmax)
+        probs = self.session.run(None, {self.input_name: batch})[0]
+
+        return [OnnxClassification(row, self.names) for row in probs]
+
+
+def load_onnx_classifier(weights: str, threads: int = 0):
+    return OnnxClassifier(export_onnx(weights), threads)
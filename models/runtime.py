@@ -0,0 +1,96 @@
+import torch
+from torch.nn.utils.fusion import fuse_conv_bn_weights
+from torchvision.ops.misc import FrozenBatchNorm2d
+from config.settings import get_settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+BATCH_NORM_TYPES = (torch.nn.BatchNorm2d, FrozenBatchNorm2d)
+
+
+def _fold_batch_norm(conv: torch.nn.Conv2d, bn):
+    weight, bias = fuse_conv_bn_weights(conv.weight, conv.bias, bn.running_mean, bn.running_var, bn.eps, bn.weight, bn.bias)
+    conv.weight = weight
+    conv.bias = bias
+
+
+def fuse_conv_bn(module: torch.nn.Module):
+    # Incorpora cada BatchNorm à convolução anterior (padrão convN/bnN da
+    # ResNet e Sequential(conv, bn) no downsample): o oneDNN passa a executar
+    # uma única convolução com bias em vez de convolução + normalização
+    fused = 0
+    for submodule in list(module.modules()):
+        for suffix in ('', '1', '2', '3'):
+            conv = getattr(submodule, f'conv{suffix}', None)
+            bn = getattr(submodule, f'bn{suffix}', None)
+            if isinstance(conv, torch.nn.Conv2d) and isinstance(bn, BATCH_NORM_TYPES):
+                _fold_batch_norm(conv, bn)
+                setattr(submodule, f'bn{suffix}', torch.nn.Identity())
+                fused += 1
+        if isinstance(submodule, torch.nn.Sequential) and len(submodule) == 2 \
+                and isinstance(submodule[0], torch.nn.Conv2d) and isinstance(submodule[1], BATCH_NORM_TYPES):
+            _fold_batch_norm(submodule[0], submodule[1])
+            submodule[1] = torch.nn.Identity()
+            fused += 1
+    return fused
+
+
+class InferenceRuntime:
+    def __init__(self, threads: int = 0, interop_threads: int = 0, inference_mode: bool = True,
+                 channels_last: bool = False, fuse_conv_bn: bool = False, compile: bool = False,
+                 compile_mode: str = "default"):
+        self.threads = threads
+        self.interop_threads = interop_threads
+        self.inference_mode = inference_mode
+        self.channels_last = channels_last
+        self.fuse_conv_bn = fuse_conv_bn
+        self.compile = compile
+        self.compile_mode = compile_mode
+
+    def configure_threads(self):
+        # 0 mantém o padrão do torch
+        if self.threads > 0:
+            torch.set_num_threads(self.threads)
+        if self.interop_threads > 0:
+            try:
+                torch.set_num_interop_threads(self.interop_threads)
+            except RuntimeError as e:
+                # Só pode ser definido antes do primeiro trabalho paralelo do processo
+                logger.warning(f'Could not set torch inter-op threads: {e}')
+
+    def inference_context(self):
+        return torch.inference_mode() if self.inference_mode else torch.no_grad()
+
+    def optimize_module(self, module: torch.nn.Module, device: torch.device):
+        if self.fuse_conv_bn:
+            fused = fuse_conv_bn(module)
+            logger.info(f'Fused {fused} conv+bn pairs in {type(module).__name__}')
+        if self.channels_last:
+            module = module.to(memory_format=torch.channels_last)
+        if self.compile:
+            # Compila apenas o forward para manter o módulo (e o state_dict) intacto
+            module.forward = torch.compile(module.forward, mode=self.compile_mode, dynamic=True)
+        return module
+
+    def optimize_yolo(self, model, device: torch.device):
+        # O YOLO já funde conv+bn com model.fuse(); os demais ajustes valem
+        # para o nn.Module interno usado pelo predictor do ultralytics
+        if self.channels_last:
+            model.model = model.model.to(memory_format=torch.channels_last)
+        if self.compile:
+            model.model.forward = torch.compile(model.model.forward, mode=self.compile_mode, dynamic=True)
+        return model
+
+
+inference_runtime = InferenceRuntime(
+    threads=settings.torch_threads,
+    interop_threads=settings.torch_interop_threads,
+    inference_mode=settings.torch_inference_mode,
+    channels_last=settings.torch_channels_last,
+    fuse_conv_bn=settings.torch_fuse_conv_bn,
+    compile=settings.torch_compile,
+    compile_mode=settings.torch_compile_mode
+)
@@ -0,0 +1,185 @@
+from typing import List, Dict, Optional
+from psycopg.types.json import Jsonb
+from infra.database import get_pool, SCHEMA_LOCK_KEY
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DetectionJobRepository:
+
+    def __init__(self):
+        self.pool = get_pool()
+
+    async def create_table(self) -> bool:
+        try:
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    # Liberado no commit, depois que a tabela e o índice já existem
+                    await cursor.execute("SELECT pg_advisory_xact_lock(%s)", (SCHEMA_LOCK_KEY,))
+                    await cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS detection_jobs (
+                        id VARCHAR(36) PRIMARY KEY,
+                        user_id VARCHAR(64),
+                        status VARCHAR(16) NOT NULL DEFAULT 'queued',
+                        image BYTEA,
+                        annotate BOOLEAN NOT NULL DEFAULT TRUE,
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        lease_until TIMESTAMP,
+                        result JSONB,
+                        result_image BYTEA,
+                        error JSONB,
+                        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                        finished_at TIMESTAMP,
+                        expires_at TIMESTAMP
+                    )
+                    """)
+                    await cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS detection_jobs_pending_idx
+                    ON detection_jobs (created_at) WHERE status IN ('queued', 'running')
+                    """)
+                    await connection.commit()
+            return True
+        except Exception as e:
+            logger.error(f'Error creating detection_jobs table: {e}')
+            return False
+
+    async def add_job(self, id: str, user_id: Optional[str], image: bytes, annotate: bool) -> Dict:
+        try:
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(
+                        "INSERT INTO detection_jobs (id, user_id, image, annotate) VALUES (%s, %s, %s, %s) RETURNING id",
+                        (id, user_id, image, annotate)
+                    )
+                    return_id = (await cursor.fetchone())[0]
+                    await connection.commit()
+                    return {
+                        "id": return_id,
+                        "added": True
+                    }
+        except Exception as e:
+            logger.error(f'Error adding detection job: {e}')
+            return {
+                "id": '',
+                "added": False
+            }
+
+    async def claim_jobs(self, limit: int, lease_seconds: float) -> List[Dict]:
+        # Um job em 'running' com o lease vencido (worker caiu no meio da
+        # inferência) volta a ser elegível para outro worker
+        try:
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute("""
+                    UPDATE detection_jobs
+                    SET status = 'running', attempts = attempts + 1,
+                        lease_until = NOW() + make_interval(secs => %s)
+                    WHERE id IN (
+                        SELECT id FROM detection_jobs
+                        WHERE status = 'queued' OR (status = 'running' AND lease_until <= NOW())
+                        ORDER BY created_at
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING id, image, annotate, attempts
+                    """, (lease_seconds, limit))
+                    jobs = await cursor.fetchall()
+                    await connection.commit()
+            return [
+                {
+                    "id": job[0],
+                    "image": job[1],
+                    "annotate": job[2],
+                    "attempts": job[3]
+                } for job in jobs
+            ]
+        except Exception as e:
+            logger.error(f'Error claiming detection jobs: {e}')
+            return []
+
+    async def complete_job(self, id: str, result: Dict, result_image: Optional[bytes], ttl_seconds: float):
+        async with self.pool.connection() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute(
+                    """
+                    UPDATE detection_jobs
+                    SET status = 'done', result = %s, result_image = %s, image = NULL,
+                        finished_at = NOW(), expires_at = NOW() + make_interval(secs => %s)
+                    WHERE id = %s
+                    """,
+                    (Jsonb(result), result_image, ttl_seconds, id)
+                )
+                await connection.commit()
+
+    async def fail_job(self, id: str, error: Dict, ttl_seconds: float):
+        async with self.pool.connection() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute(
+                    """
+                    UPDATE detection_jobs
+                    SET status = 'failed', error = %s, image = NULL,
+                        finished_at = NOW(), expires_at = NOW() + make_interval(secs => %s)
+                    WHERE id = %s
+                    """,
+                    (Jsonb(error), ttl_seconds, id)
+                )
+                await connection.commit()
+
+    async def release_job(self, id: str, refund_attempt: bool = False):
+        async with self.pool.connection() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute(
+                    # refund_attempt devolve a tentativa contada no claim quando o
+                    # job voltou para a fila sem chegar a rodar
+                    """
+                    UPDATE detection_jobs
+                    SET status = 'queued', lease_until = NULL,
+                        attempts = CASE WHEN %s THEN GREATEST(attempts - 1, 0) ELSE attempts END
+                    WHERE id = %s
+                    """,
+                    (refund_attempt, id)
+                )
+                await connection.commit()
+
+    async def get_job(self, id: str) -> Optional[Dict]:
+        try:
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(
+                        """
+                        SELECT id, user_id, status, result, result_image, error, attempts, created_at, finished_at
+                        FROM detection_jobs
+                        WHERE id = %s AND (expires_at IS NULL OR expires_at > NOW())
+                        """,
+                        (id,)
+                    )
+                    job = await cursor.fetchone()
+            if not job:
+                return None
+            return {
+                "id": job[0],
+                "user_id": job[1],
+                "status": job[2],
+                "result": job[3],
+                "result_image": job[4],
+                "error": job[5],
+                "attempts": job[6],
+                "created_at": job[7],
+                "finished_at": job[8]
+            }
+        except Exception as e:
+            logger.error(f'Error getting detection job: {e}')
+            return None
+
+    async def delete_expired(self) -> int:
+        try:
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute("DELETE FROM detection_jobs WHERE expires_at <= NOW()")
+                    deleted = cursor.rowcount
+                    await connection.commit()
+            return deleted
+        except Exception as e:
+            logger.error(f'Error deleting expired detection jobs: {e}')
+            return 0
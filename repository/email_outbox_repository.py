@@ -0,0 +1,111 @@
+from typing import List, Dict
+from psycopg.types.json import Jsonb
+from infra.database import get_pool, SCHEMA_LOCK_KEY
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class EmailOutboxRepository:
+
+    def __init__(self):
+        self.pool = get_pool()
+
+    async def create_table(self) -> bool:
+        try:
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    # Liberado no commit, depois que a tabela já existe
+                    await cursor.execute("SELECT pg_advisory_xact_lock(%s)", (SCHEMA_LOCK_KEY,))
+                    await cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS email_outbox (
+                        id VARCHAR(36) PRIMARY KEY,
+                        payload JSONB NOT NULL,
+                        status VARCHAR(16) NOT NULL DEFAULT 'pending',
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        next_attempt_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                        last_error TEXT,
+                        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                        sent_at TIMESTAMP
+                    )
+                    """)
+                    await connection.commit()
+            return True
+        except Exception as e:
+            logger.error(f'Error creating email_outbox table: {e}')
+            return False
+
+    async def add_email(self, id: str, payload: Dict) -> Dict:
+        try:
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(
+                        "INSERT INTO email_outbox (id, payload) VALUES (%s, %s) RETURNING id",
+                        (id, Jsonb(payload))
+                    )
+                    return_id = (await cursor.fetchone())[0]
+                    await connection.commit()
+                    return {
+                        "id": return_id,
+                        "added": True
+                    }
+        except Exception as e:
+            logger.error(f'Error adding email to outbox: {e}')
+            return {
+                "id": '',
+                "added": False
+            }
+
+    async def claim_due_emails(self, limit: int, lease_seconds: float) -> List[Dict]:
+        # O lease faz com que um e-mail preso em 'sending' (worker caiu durante
+        # o envio) volte a ser elegível depois de lease_seconds
+        try:
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute("""
+                    UPDATE email_outbox
+                    SET status = 'sending', next_attempt_at = NOW() + make_interval(secs => %s)
+                    WHERE id IN (
+                        SELECT id FROM email_outbox
+                        WHERE status IN ('pending', 'sending') AND next_attempt_at <= NOW()
+                        ORDER BY created_at
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING id, payload, attempts
+                    """, (lease_seconds, limit))
+                    emails = await cursor.fetchall()
+                    await connection.commit()
+            return [
+                {
+                    "id": email[0],
+                    "payload": email[1],
+                    "attempts": email[2]
+                } for email in emails
+            ]
+        except Exception as e:
+            logger.error(f'Error claiming emails from outbox: {e}')
+            return []
+
+    async def mark_sent(self, id: str):
+        async with self.pool.connection() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute(
+                    "UPDATE email_outbox SET status = 'sent', sent_at = NOW(), attempts = attempts + 1 WHERE id = %s",
+                    (id,)
+                )
+                await connection.commit()
+
+    async def mark_failed(self, id: str, attempts: int, retry_in_seconds: float, error: str, dead: bool):
+        async with self.pool.connection() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute(
+                    """
+                    UPDATE email_outbox
+                    SET status = %s, attempts = %s, last_error = %s,
+                        next_attempt_at = NOW() + make_interval(secs => %s)
+                    WHERE id = %s
+                    """,
+                    ('failed' if dead else 'pending', attempts, error, retry_in_seconds, id)
+                )
+                await connection.commit()
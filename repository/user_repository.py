@@ -1,23 +1,21 @@
+import asyncio
 from typing import List, Dict
-import psycopg2
-import pymssql
-from config.settings import Settings
-from infra.database import get_database
+from infra.database import get_pool
+from infra.pronto_database import get_pronto_pool
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-settings = Settings()
-
 class UserRepository:
 
-    def __init__(self):
-        self.db_connection = get_database()
+    def __init__(self, pool=None, pronto_pool=None):
+        self.pool = pool or get_pool()
+        self.pronto_pool = pronto_pool or get_pronto_pool()
     
     async def create_user(self, user: Dict):
         try:
-            with psycopg2.connect(self.db_connection) as connection:
-                with connection.cursor() as cursor:
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
                     sql = """
                     INSERT INTO user_rx (id, full_name, email, profile, password)
                     VALUES (%s, %s, %s, %s, %s)
@@ -30,9 +28,9 @@ class UserRepository:
                         user['profile'],
                         user['password']
                     )
-                    cursor.execute(sql, values)
-                    return_id = cursor.fetchone()[0]
-                    connection.commit()
+                    await cursor.execute(sql, values)
+                    return_id = (await cursor.fetchone())[0]
+                    await connection.commit()
                     
                     return {
                         "id": return_id,
@@ -49,12 +47,10 @@ class UserRepository:
     async def get_user_by_email(self, email: str) -> Dict:
             
             try:
-                connection = psycopg2.connect(self.db_connection)
-                cursor = connection.cursor()
-                cursor.execute("SELECT * FROM user_rx WHERE email = %s", (email,))
-                user = cursor.fetchone()
-                cursor.close()
-                connection.close()
+                async with self.pool.connection() as connection:
+                    async with connection.cursor() as cursor:
+                        await cursor.execute("SELECT * FROM user_rx WHERE email = %s", (email,))
+                        user = await cursor.fetchone()
     
                 if user:
                     return {
@@ -72,15 +68,7 @@ class UserRepository:
                 return None
 
     async def get_user_pronto_by_username_with_fullname(self, username: str) -> Dict:
-        try:
-            connection = pymssql.connect(
-                server=settings.server,
-                port=settings.port,
-                user=settings.user_pronto,
-                password=settings.password,
-                database=settings.database,
-            )
-
+        def fetch_user(connection):
             cursor = connection.cursor()
             cursor.execute("""
                 SELECT 
@@ -95,7 +83,11 @@ class UserRepository:
 
             user = cursor.fetchone()
             cursor.close()
-            connection.close()
+            return user
+
+        try:
+            # A consulta roda em uma thread do pool do Pronto, fora do event loop
+            user = await self.pronto_pool.run(fetch_user)
 
             if user:
                 print(f'User by Pronto in repository: {user}') 
@@ -106,6 +98,9 @@ class UserRepository:
                     "fullname": user[3]
                 }
 
+        except asyncio.TimeoutError:
+            logger.error(f'Error getting user by Pronto with fullname by username: timeout')
+            return None
         except Exception as e:
             logger.error(f'Error getting user by Pronto with fullname by username: {e}')
             return None
@@ -115,12 +110,10 @@ class UserRepository:
 
     async def get_user_by_id(self, id: str) -> Dict:
         try:
-            connection = psycopg2.connect(self.db_connection)
-            cursor = connection.cursor()
-            cursor.execute("SELECT * FROM user_rx WHERE id = %s", (id,))
-            user = cursor.fetchone()
-            cursor.close()
-            connection.close()
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute("SELECT * FROM user_rx WHERE id = %s", (id,))
+                    user = await cursor.fetchone()
 
             if user:
                 return {
@@ -140,12 +133,10 @@ class UserRepository:
     
     async def get_users(self) -> List[Dict]:
         try:
-            connection = psycopg2.connect(self.db_connection)
-            cursor = connection.cursor()
-            cursor.execute("SELECT * FROM user_rx")
-            users = cursor.fetchall()
-            cursor.close()
-            connection.close()
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute("SELECT * FROM user_rx")
+                    users = await cursor.fetchall()
 
             if users:
                 return [
@@ -166,8 +157,8 @@ class UserRepository:
 
     async def update_user(self, id: str, user: Dict):
         try:
-            with psycopg2.connect(self.db_connection) as connection:
-                with connection.cursor() as cursor:
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
                     sql = """
                     UPDATE user_rx
                     SET full_name = %s, email = %s, profile = %s
@@ -179,8 +170,8 @@ class UserRepository:
                         user['profile'],
                         id
                     )
-                    cursor.execute(sql, values)
-                    connection.commit()
+                    await cursor.execute(sql, values)
+                    await connection.commit()
                     
                     return {
                         "id": id,
@@ -197,8 +188,8 @@ class UserRepository:
 
     async def update_password_user(self, id: str, password: str):
         try:
-            with psycopg2.connect(self.db_connection) as connection:
-                with connection.cursor() as cursor:
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
                     sql = """
                     UPDATE user_rx
                     SET password = %s
@@ -208,8 +199,8 @@ class UserRepository:
                         password,
                         id
                     )
-                    cursor.execute(sql, values)
-                    connection.commit()
+                    await cursor.execute(sql, values)
+                    await connection.commit()
                     
                     return {
                         "id": id,
@@ -224,16 +215,14 @@ class UserRepository:
         
     async def add_code_verification(self, user_data: Dict) -> Dict:
         try:
-            connection = psycopg2.connect(self.db_connection)
-            cursor = connection.cursor()
-            cursor.execute(
-                "INSERT INTO forgot_password (id, user_id, user_email, code_verification, used, created_at, expiration_at) VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING id",
-                (user_data["id"], user_data["user_id"], user_data["email"], user_data["code_verification"], user_data["used"], user_data["created_at"], user_data["expiration_at"])
-            )
-            logged_id = cursor.fetchone()[0]
-            connection.commit()
-            cursor.close()
-            connection.close()
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(
+                        "INSERT INTO forgot_password (id, user_id, user_email, code_verification, used, created_at, expiration_at) VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING id",
+                        (user_data["id"], user_data["user_id"], user_data["email"], user_data["code_verification"], user_data["used"], user_data["created_at"], user_data["expiration_at"])
+                    )
+                    logged_id = (await cursor.fetchone())[0]
+                    await connection.commit()
             logger.info(f"Code verification added for {user_data['email']}")
             return {
                 "logged_id": logged_id,
@@ -248,12 +237,10 @@ class UserRepository:
     
     async def get_code_verification(self, email: str, code: int) -> Dict:
         try:
-            connection = psycopg2.connect(self.db_connection)
-            cursor = connection.cursor()
-            cursor.execute("SELECT * FROM forgot_password WHERE user_email = %s AND code_verification = %s AND used = %s", (email, code.code, False))
-            code_saved = cursor.fetchone()
-            cursor.close()
-            connection.close()
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute("SELECT * FROM forgot_password WHERE user_email = %s AND code_verification = %s AND used = %s", (email, code.code, False))
+                    code_saved = await cursor.fetchone()
             if code_saved:
                 logger.info(f"Code verification found for {email}")
                 return {
@@ -274,12 +261,10 @@ class UserRepository:
     
     async def verify_code_exist(self, id: str) -> Dict:
         try:
-            connection = psycopg2.connect(self.db_connection)
-            cursor = connection.cursor()
-            cursor.execute("SELECT * FROM forgot_password WHERE id = %s", (id,))
-            code_saved = cursor.fetchone()
-            cursor.close()
-            connection.close()
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute("SELECT * FROM forgot_password WHERE id = %s", (id,))
+                    code_saved = await cursor.fetchone()
             if code_saved:
                 logger.info(f"Code verification found for {id}")
                 return {
@@ -300,16 +285,14 @@ class UserRepository:
     
     async def update_code_verification(self, code_verification: Dict) -> Dict:
         try:
-            connection = psycopg2.connect(self.db_connection)
-            cursor = connection.cursor()
-            cursor.execute(
-                "UPDATE forgot_password SET used = %s WHERE user_email = %s AND code_verification = %s RETURNING id",
-                (True, code_verification['email'], code_verification['code_verification'])
-            )
-            updated_id = cursor.fetchone()
-            connection.commit()
-            cursor.close()
-            connection.close()
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(
+                        "UPDATE forgot_password SET used = %s WHERE user_email = %s AND code_verification = %s RETURNING id",
+                        (True, code_verification['email'], code_verification['code_verification'])
+                    )
+                    updated_id = await cursor.fetchone()
+                    await connection.commit()
             if updated_id:
                 logger.info(f"Code verification updated for {code_verification['email']}")
                 return {
@@ -331,17 +314,15 @@ class UserRepository:
     
     async def update_code_verification_with_resend(self, code_data: Dict, email, id_verification) -> Dict:
         try:
-            connection = psycopg2.connect(self.db_connection)
-            cursor = connection.cursor()
-            cursor.execute(
-                "UPDATE forgot_password SET used = %s, code_verification = %s, expiration_at = %s WHERE user_email = %s AND id = %s RETURNING id",
-                (False, code_data['code_verification'], code_data['expiration_at'], email, id_verification)
-            )
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(
+                        "UPDATE forgot_password SET used = %s, code_verification = %s, expiration_at = %s WHERE user_email = %s AND id = %s RETURNING id",
+                        (False, code_data['code_verification'], code_data['expiration_at'], email, id_verification)
+                    )
 
-            updated_id = cursor.fetchone()
-            connection.commit()
-            cursor.close()
-            connection.close()
+                    updated_id = await cursor.fetchone()
+                    await connection.commit()
             if updated_id:
                 logger.info(f"Code verification updated for {code_data['email']}")
                 return {
@@ -364,16 +345,14 @@ class UserRepository:
         
     async def update_password_when_forgot_password(self, email: str, password: str) -> Dict:
         try:
-            connection = psycopg2.connect(self.db_connection)
-            cursor = connection.cursor()
-            cursor.execute(
-                "UPDATE user_rx SET password = %s WHERE email = %s RETURNING email",
-                (password, email)
-            )
-            updated_email = cursor.fetchone()
-            connection.commit()
-            cursor.close()
-            connection.close()
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(
+                        "UPDATE user_rx SET password = %s WHERE email = %s RETURNING email",
+                        (password, email)
+                    )
+                    updated_email = await cursor.fetchone()
+                    await connection.commit()
             if updated_email:
                 logger.info(f"Password updated for {email}")
                 return {
@@ -395,14 +374,14 @@ class UserRepository:
     
     async def delete_user(self, id: str):
         try:
-            with psycopg2.connect(self.db_connection) as connection:
-                with connection.cursor() as cursor:
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
                     sql = """
                     DELETE FROM user_rx
                     WHERE id = %s
                     """
-                    cursor.execute(sql, (id,))
-                    connection.commit()
+                    await cursor.execute(sql, (id,))
+                    await connection.commit()
                     
                     return {
                         "id": id,
@@ -418,8 +397,8 @@ class UserRepository:
 
     async def create_feedback(self, feedback: Dict):
         try:
-            with psycopg2.connect(self.db_connection) as connection:
-                with connection.cursor() as cursor:
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
                     sql = """
                     INSERT INTO feedbacks (id, user_name, feedback, prediction_made, correct_prediction, created_at)
                     VALUES (%s, %s, %s, %s, %s, %s)
@@ -433,9 +412,9 @@ class UserRepository:
                         feedback['correct_prediction'],
                         feedback['created_at']
                     )
-                    cursor.execute(sql, values)
-                    return_id = cursor.fetchone()[0]
-                    connection.commit()
+                    await cursor.execute(sql, values)
+                    return_id = (await cursor.fetchone())[0]
+                    await connection.commit()
                     
                     return {
                         "id": return_id,
@@ -451,12 +430,10 @@ class UserRepository:
 
     async def get_feedback(self) -> List[Dict]:
         try:
-            connection = psycopg2.connect(self.db_connection)
-            cursor = connection.cursor()
-            cursor.execute("SELECT * FROM feedbacks")
-            feedbacks = cursor.fetchall()
-            cursor.close()
-            connection.close()
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute("SELECT * FROM feedbacks")
+                    feedbacks = await cursor.fetchall()
 
             if feedbacks:
                 return [
@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from controllers import health_controller
+
+router = APIRouter()
+
+@router.get("/health/live")
+async def live():
+    return await health_controller.handle_live()
+
+@router.get("/health/ready")
+async def ready():
+    return await health_controller.handle_ready()
@@ -0,0 +1,15 @@
+from typing import Literal
+from fastapi import APIRouter, UploadFile, File, Query, Request
+from controllers import job_controller
+
+router = APIRouter()
+
+@router.post("/jobs/detect", status_code=202)
+async def submit_detect_job(request: Request,
+                            file: UploadFile = File(...),
+                            output: Literal["json", "detections"] = Query("json")):
+    return await job_controller.handle_submit_detect(request, file, output)
+
+@router.get("/jobs/{job_id}")
+async def get_job(request: Request, job_id: str, wait: float = Query(0, ge=0)):
+    return await job_controller.handle_get_job(request, job_id, wait)
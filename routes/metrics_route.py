@@ -0,0 +1,8 @@
+from fastapi import APIRouter
+from controllers import metrics_controller
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def get_metrics():
+    return await metrics_controller.handle_metrics()
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, UploadFile, File
+from typing import List, Literal, Optional
+from fastapi import APIRouter, UploadFile, File, Query, Header
 from controllers import prediction_controller
 from utils.examples_routes_returns import ResponseExamples
 
@@ -7,9 +8,30 @@ router = APIRouter()
 response_examples = ResponseExamples()
 
 @router.post("/predict", responses=response_examples.handle_prediction())
-async def predict(file: UploadFile = File(...)):
-    return await prediction_controller.handle_prediction(file)
+async def predict(file: UploadFile = File(...),
+                  cache_control: Optional[str] = Header(None)):
+    return await prediction_controller.handle_prediction(file, cache_control)
+
+@router.post("/predict/batch")
+async def predict_batch(files: List[UploadFile] = File(...),
+                        cache_control: Optional[str] = Header(None)):
+    return await prediction_controller.handle_prediction_batch(files, cache_control)
+
+DetectOutput = Literal["json", "detections", "image", "multipart", "url"]
 
 @router.post("/detect")
-async def detect_breast_cancer(file: UploadFile = File(...)):
-    return await prediction_controller.handle_detect_breast_cancer_with_fastRCNN(file)
+async def detect_breast_cancer(file: UploadFile = File(...),
+                               output: DetectOutput = Query("json"),
+                               x_detect_output: Optional[DetectOutput] = Header(None),
+                               cache_control: Optional[str] = Header(None)):
+    return await prediction_controller.handle_detect_breast_cancer_with_fastRCNN(file, x_detect_output or output, cache_control)
+
+@router.post("/detect/batch")
+async def detect_batch(files: List[UploadFile] = File(...),
+                       output: Literal["detections", "url"] = Query("detections"),
+                       cache_control: Optional[str] = Header(None)):
+    return await prediction_controller.handle_detect_batch(files, output, cache_control)
+
+@router.get("/detect/result/{result_id}")
+async def detect_result(result_id: str):
+    return await prediction_controller.handle_detect_result(result_id)
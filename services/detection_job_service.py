@@ -0,0 +1,160 @@
+import asyncio
+import time
+import uuid
+from fastapi import HTTPException
+from config.settings import get_settings
+from repository.detection_job_repository import DetectionJobRepository
+from services import prediction_service
+from utils.inference_executor import inference_executor
+from utils.metrics import metrics
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+FINISHED_STATUSES = ('done', 'failed')
+
+
+class DetectionJobService:
+    def __init__(self):
+        self.job_repository = DetectionJobRepository()
+        self._tasks = []
+        self._table_ready = False
+        self._wake_up = asyncio.Event()
+        self._finished = {}
+        self._last_cleanup = 0.0
+
+    async def submit(self, image_data: bytes, annotate: bool, user_id: str = None) -> str:
+        job_id = str(uuid.uuid4())
+        job_added = await self.job_repository.add_job(job_id, user_id, image_data, annotate)
+        if not job_added['added']:
+            raise HTTPException(status_code=500, detail="An error occurred while creating the detection job. Please try again later.")
+        metrics.increment('detection_jobs_submitted_total')
+        self._wake_up.set()
+        return job_id
+
+    async def get(self, job_id: str, wait_seconds: float = 0):
+        # Long-poll: jobs concluídos neste processo acordam a espera na hora;
+        # os concluídos por outros workers são vistos no próximo intervalo
+        deadline = time.monotonic() + wait_seconds
+        while True:
+            job = await self.job_repository.get_job(job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job['status'] in FINISHED_STATUSES or remaining <= 0:
+                self._finished.pop(job_id, None)
+                return job
+
+            event = self._finished.setdefault(job_id, asyncio.Event())
+            try:
+                await asyncio.wait_for(event.wait(), timeout=min(remaining, settings.job_poll_interval_seconds))
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self):
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(settings.job_workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def _run(self):
+        while True:
+            try:
+                # Como no outbox de e-mails, a tabela é criada pelo loop para que
+                # o worker suba mesmo com o Postgres fora do ar
+                if not self._table_ready:
+                    self._table_ready = await self.job_repository.create_table()
+
+                jobs = []
+                if self._table_ready:
+                    # Vários jobs são processados em uma única passagem do modelo
+                    jobs = await self.job_repository.claim_jobs(
+                        limit=settings.detect_max_batch_size,
+                        lease_seconds=settings.job_lease_seconds
+                    )
+                    if jobs:
+                        await self._process(jobs)
+                    else:
+                        await self._remove_expired()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f'Error processing detection jobs: {e}')
+                jobs = []
+
+            if jobs:
+                continue
+
+            self._wake_up.clear()
+            try:
+                await asyncio.wait_for(self._wake_up.wait(), timeout=settings.job_poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _process(self, jobs: list):
+        runnable = []
+        for job in jobs:
+            if job['attempts'] > settings.job_max_attempts:
+                await self._fail(job['id'], {"status_code": 500, "detail": "The detection job exceeded the maximum number of attempts."})
+            else:
+                runnable.append(job)
+        if not runnable:
+            return
+
+        try:
+            results = await inference_executor.run(
+                prediction_service.detect_breast_cancer_with_fastRCNN_batch,
+                [job['image'] for job in runnable],
+                [job['annotate'] for job in runnable]
+            )
+        except Exception as e:
+            # Executor cheio (503) ou falha inesperada: os jobs voltam para a fila.
+            # Só a falha inesperada conta como tentativa; com o executor cheio o
+            # job nem chegou a rodar e não pode esgotar job_max_attempts
+            busy = isinstance(e, HTTPException) and e.status_code == 503
+            logger.error(f'Error running detection jobs, requeueing {len(runnable)}: {e}')
+            for job in runnable:
+                await self.job_repository.release_job(job['id'], refund_attempt=busy)
+            await asyncio.sleep(settings.inference_retry_after)
+            return
+
+        for job, result in zip(runnable, results):
+            if isinstance(result, HTTPException):
+                await self._fail(job['id'], {"status_code": result.status_code, "detail": result.detail})
+                continue
+            await self.job_repository.complete_job(
+                job['id'],
+                {"detections": result["detections"]},
+                result["image"],
+                settings.job_result_ttl_seconds
+            )
+            metrics.increment('detection_jobs_done_total')
+            self._notify(job['id'])
+
+    async def _fail(self, job_id: str, error: dict):
+        await self.job_repository.fail_job(job_id, error, settings.job_result_ttl_seconds)
+        metrics.increment('detection_jobs_failed_total')
+        self._notify(job_id)
+
+    def _notify(self, job_id: str):
+        event = self._finished.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    async def _remove_expired(self):
+        if time.monotonic() - self._last_cleanup < settings.job_cleanup_interval_seconds:
+            return
+        self._last_cleanup = time.monotonic()
+        deleted = await self.job_repository.delete_expired()
+        if deleted:
+            logger.info(f'Removed {deleted} expired detection jobs')
+
+
+detection_job_service = DetectionJobService()
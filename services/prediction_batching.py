@@ -0,0 +1,26 @@
+from config.settings import get_settings
+from services import prediction_service
+from utils.micro_batcher import MicroBatcher
+
+settings = get_settings()
+
+
+def _detect_batch(items: list):
+    images_data = [image_data for image_data, _ in items]
+    annotate = [annotate for _, annotate in items]
+    return prediction_service.detect_breast_cancer_with_fastRCNN_batch(images_data, annotate)
+
+
+predict_batcher = MicroBatcher(
+    'predict',
+    prediction_service.predict_images,
+    max_batch_size=settings.predict_max_batch_size,
+    max_wait_ms=settings.predict_max_wait_ms
+)
+
+detect_batcher = MicroBatcher(
+    'detect',
+    _detect_batch,
+    max_batch_size=settings.detect_max_batch_size,
+    max_wait_ms=settings.detect_max_wait_ms
+)
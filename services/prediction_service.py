@@ -1,22 +1,22 @@
 import numpy as np
-from PIL import Image, UnidentifiedImageError, ImageDraw, ImageFont
-import os
+from PIL import Image, UnidentifiedImageError
 import io
-from models.model import load_model, load_model_breast_cancer, load_model_breast_cancer_with_fatRCNN
-from utils.load_file import load_file_to_dictionary
+from models.model import device
+from models.model_registry import model_registry
+from utils.probs_to_dictionary import probs_to_dictionary
+from utils.annotation_renderer import annotation_renderer
 from fastapi import HTTPException
 import cv2
-import torch
-from torchvision.transforms import ToTensor
 from torchvision.ops import nms
+from config.settings import get_settings
+from utils.image_decoder import decode_and_resize
+from models.runtime import inference_runtime
 
+settings = get_settings()
 
+SCORE_THRESHOLD = 0.4
+NMS_THRESHOLD = 0.4
 
-model = load_model()
-model_breast_cancer = load_model_breast_cancer()
-
-device = torch.device('cuda') if torch.cuda.is_available() else torch.device('cpu')
-model_breast_cancer_faster_rcnn = load_model_breast_cancer_with_fatRCNN(device)
 
 def predict_image(image_data: bytes):
     try:
@@ -25,17 +25,13 @@ def predict_image(image_data: bytes):
         if not image:
             raise HTTPException(status_code=400, detail="An error occurred while processing the image. Please check that the image is in the correct format and try again.")
         
+        model = model_registry.get('respiratory')
         prediction = model(image)
 
         if not prediction[0]:
             raise HTTPException(status_code=400, detail="An error occurred while processing the image. Please check that the image is in the correct format and try again.")
 
-        prediction[0].save_txt('results.txt')
-
-        result_dict = load_file_to_dictionary('results.txt')
-        
-        if os.path.exists('results.txt'):
-            os.remove('results.txt')
+        result_dict = probs_to_dictionary(prediction[0].probs, prediction[0].names)
 
         return result_dict
 
@@ -46,6 +42,39 @@ def predict_image(image_data: bytes):
         raise http_exc
 
 
+def predict_images(images_data: list):
+    results = [None] * len(images_data)
+    images = []
+    indexes = []
+
+    for index, image_data in enumerate(images_data):
+        try:
+            image = Image.open(io.BytesIO(image_data))
+            # Image.open só lê o cabeçalho: a decodificação completa é forçada
+            # aqui para que um arquivo truncado falhe sozinho, e não derrube a
+            # passagem do modelo de todo o lote
+            image.load()
+            images.append(image)
+            indexes.append(index)
+        except (OSError, Image.DecompressionBombError):
+            results[index] = HTTPException(status_code=400, detail="An error occurred while processing the image. Please check that the image is in the correct format and try again.")
+
+    if not images:
+        return results
+
+    # Uma única passagem do modelo para todas as imagens do lote
+    model = model_registry.get('respiratory')
+    predictions = model(images)
+
+    for index, prediction in zip(indexes, predictions):
+        if not prediction:
+            results[index] = HTTPException(status_code=400, detail="An error occurred while processing the image. Please check that the image is in the correct format and try again.")
+        else:
+            results[index] = probs_to_dictionary(prediction.probs, prediction.names)
+
+    return results
+
+
 def detect_breast_cancer(image_data: bytes):
     try:
         image = Image.open(io.BytesIO(image_data)).convert('RGB')
@@ -54,6 +83,7 @@ def detect_breast_cancer(image_data: bytes):
         if image_np.size == 0:
             raise HTTPException(status_code=400, detail="A imagem está vazia ou não pode ser processada.")
 
+        model_breast_cancer = model_registry.get('breast_cancer')
         results = model_breast_cancer(image_np)
 
         detections = []
@@ -96,186 +126,126 @@ def detect_breast_cancer(image_data: bytes):
         ) from exc
 
 
-def detect_breast_cancer_with_fastRCNN(image_data: bytes):
-    try:
-        image = Image.open(io.BytesIO(image_data)).convert('RGB')
-        
-        # Normaliza o tamanho da imagem
-        max_dimension = 1024  # Dimensão máxima permitida
-        width, height = image.size
-        
-        # Calcula a nova dimensão mantendo a proporção
-        if width > max_dimension or height > max_dimension:
-            if width > height:
-                new_width = max_dimension
-                new_height = int((height * max_dimension) / width)
-            else:
-                new_height = max_dimension
-                new_width = int((width * max_dimension) / height)
-            
-            # Redimensiona a imagem mantendo a qualidade
-            image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-        image_np = np.array(image)
+def _fastRCNN_http_exception(exc: Exception):
+    if isinstance(exc, HTTPException):
+        return exc
+    if isinstance(exc, UnidentifiedImageError):
+        return HTTPException(
+            status_code=400,
+            detail="Erro ao processer a imagem. Verifique se o formato está correto e tente novamente."
+        )
+    return HTTPException(
+        status_code=500,
+        detail="Ocorreu um erro ao processar a imagem. Por favor, tente novamente mais tarde."
+    )
 
-        if image_np.size == 0:
-            raise HTTPException(status_code=400, detail="A imagem está vazia ou não pode ser processada.")
 
-        # Prepara a imagem para o modelo
-        transform = ToTensor()
-        img_tensor = transform(image).to(device)
+def _prepare_image_fastRCNN(image_data: bytes):
+    # Decodifica, normaliza o tamanho e gera o tensor em uma única etapa
+    image, img_tensor = decode_and_resize(image_data, settings.detect_max_dimension, settings.detect_resampling)
 
-        # Realiza a predição
-        with torch.no_grad():
-            prediction = model_breast_cancer_faster_rcnn([img_tensor])
+    if image.width == 0 or image.height == 0:
+        raise HTTPException(status_code=400, detail="A imagem está vazia ou não pode ser processada.")
 
-        # Processa as predições
-        boxes = prediction[0]['boxes']
-        labels = prediction[0]['labels']
-        scores = prediction[0]['scores']
+    return image, img_tensor.to(device)
 
-        # Aplica limiar de confiança
-        score_threshold = 0.4
-        keep = scores >= score_threshold
 
-        boxes = boxes[keep]
-        labels = labels[keep]
-        scores = scores[keep]
+def _filter_prediction_fastRCNN(prediction: dict):
+    # Processa as predições
+    boxes = prediction['boxes']
+    labels = prediction['labels']
+    scores = prediction['scores']
 
-        nms_threshold = 0.4
-        indices = nms(boxes, scores, nms_threshold)
+    # Aplica limiar de confiança
+    keep = scores >= SCORE_THRESHOLD
 
-        boxes = boxes[indices]
-        labels = labels[indices]
-        scores = scores[indices]
+    boxes = boxes[keep]
+    labels = labels[keep]
+    scores = scores[keep]
 
-        boxes = boxes.cpu().numpy()
-        labels = labels.cpu().numpy()
-        scores = scores.cpu().numpy()
+    indices = nms(boxes, scores, NMS_THRESHOLD)
 
-        detections = []
-        if len(boxes) > 0:
-            # Anota a imagem
-            image_with_boxes = image.copy()
-            draw = ImageDraw.Draw(image_with_boxes)
-
-            labels_map = {1: 'Mass'}
-
-            # Calcula dimensões mínimas garantidas para visualização
-            image_width, image_height = image.size
-            min_line_width = max(3, int(min(image_width, image_height) * 0.005))
-            min_font_size = max(16, int(min(image_width, image_height) * 0.02))
-
-            for box, label, score in zip(boxes, labels, scores):
-                xmin, ymin, xmax, ymax = box
-                xmin, ymin, xmax, ymax = int(xmin), int(ymin), int(xmax), int(ymax)
-
-                # Calcula a largura e altura da caixa delimitadora
-                box_width = xmax - xmin
-                box_height = ymax - ymin
-
-                # Define espessura da linha proporcional à imagem, com mínimo garantido
-                line_width = max(min_line_width, int(min(box_width, box_height) * 0.02))
-
-                # Define tamanho da fonte proporcional à imagem, com mínimo garantido
-                font_size = max(min_font_size, int(min(box_width, box_height) * 0.1))
-
-                try:
-                    font = ImageFont.truetype("arial.ttf", size=font_size)
-                except IOError:
-                    # Se arial.ttf não estiver disponível, tenta DejaVuSans
-                    try:
-                        font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size=font_size)
-                    except IOError:
-                        font = ImageFont.load_default()
-
-                # Desenha a caixa delimitadora com borda dupla para maior destaque
-                # Borda externa preta
-                draw.rectangle([(xmin-line_width, ymin-line_width), 
-                              (xmax+line_width, ymax+line_width)], 
-                              outline='black', width=line_width+2)
-                # Borda interna colorida
-                draw.rectangle([(xmin, ymin), (xmax, ymax)], 
-                             outline='red', width=line_width)
-
-                # Obtém o nome da classe
-                class_name = labels_map.get(label, 'desconhecido')
-
-                # Cria o texto com o rótulo e a pontuação
-                text = f"{score:.2f}"
-
-                # Calcula a posição e o tamanho do texto
-                text_size = draw.textbbox((0, 0), text, font=font)
-                text_width = text_size[2] - text_size[0]
-                text_height = text_size[3] - text_size[1]
-
-                # Adiciona padding ao texto para melhor legibilidade
-                padding = max(4, int(text_height * 0.2))
-
-                # Coordenadas para o fundo do texto
-                text_xmin = xmin
-                text_ymin = max(0, ymin - text_height - padding * 2)  # Garante que não saia da imagem
-                text_xmax = xmin + text_width + padding * 2
-                text_ymax = text_ymin + text_height + padding * 2
-
-                # Se o texto ficaria fora da imagem no topo, coloca abaixo da caixa
-                if text_ymin < 0:
-                    text_ymin = min(ymax, image_height - text_height - padding * 2)
-                    text_ymax = text_ymin + text_height + padding * 2
-
-                # Desenha um contorno preto ao redor do fundo do texto
-                draw.rectangle([(text_xmin-2, text_ymin-2), (text_xmax+2, text_ymax+2)], 
-                             fill='red')
-                # Desenha o retângulo de fundo para o texto
-                draw.rectangle([(text_xmin, text_ymin), (text_xmax, text_ymax)], 
-                             fill='red')
-
-                # Escreve o texto com contorno preto para maior contraste
-                for offset in [(1,1), (-1,-1), (1,-1), (-1,1)]:
-                    draw.text((text_xmin + padding + offset[0], text_ymin + padding + offset[1]),
-                            text, fill='black', font=font)
-                # Texto principal em branco
-                draw.text((text_xmin + padding, text_ymin + padding),
-                         text, fill='white', font=font)
-
-                # Adiciona a detecção à lista
-                detections.append({
-                    "class_id": int(label),
-                    "confidence": float(score),
-                    "bbox": [xmin, ymin, xmax, ymax]
-                })
+    boxes = boxes[indices]
+    labels = labels[indices]
+    scores = scores[indices]
 
-            # Converte a imagem anotada para formato OpenCV
-            annotated_image = np.array(image_with_boxes)
-            annotated_image = cv2.cvtColor(annotated_image, cv2.COLOR_RGB2BGR)
-        else:
-            annotated_image = cv2.cvtColor(image_np, cv2.COLOR_RGB2BGR)
+    boxes = boxes.cpu().numpy()
+    labels = labels.cpu().numpy()
+    scores = scores.cpu().numpy()
 
-        # Codifica a imagem em bytes
-        success, img_encoded = cv2.imencode('.jpg', annotated_image, [cv2.IMWRITE_JPEG_QUALITY, 95])
-        if not success:
-            raise HTTPException(status_code=500, detail="Falha ao codificar a imagem.")
-        img_bytes = img_encoded.tobytes()
+    return boxes, labels, scores
 
-        return {
-            "image": img_bytes,
-            "detections": detections
-        }
 
-    except UnidentifiedImageError:
-        raise HTTPException(
-            status_code=400,
-            detail="Erro ao processer a imagem. Verifique se o formato está correto e tente novamente."
-        )
-    except HTTPException as http_exc:
-        raise http_exc
+def _build_detections_fastRCNN(boxes, labels, scores):
+    return [
+        {
+            "class_id": int(label),
+            "confidence": float(score),
+            "bbox": [int(coordinate) for coordinate in box]
+        } for box, label, score in zip(boxes, labels, scores)
+    ]
+
+
+def _annotate_image_fastRCNN(image, boxes, scores):
+    if len(boxes) > 0:
+        image = annotation_renderer.draw(image, boxes, scores)
+
+    # Codifica a imagem em bytes direto do PIL, sem conversão para BGR do OpenCV
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=95)
+
+    return buffer.getvalue()
+
+
+def detect_breast_cancer_with_fastRCNN_batch(images_data: list, annotate: list = None):
+    results = [None] * len(images_data)
+    annotate = annotate or [True] * len(images_data)
+    prepared = []
+
+    for index, image_data in enumerate(images_data):
+        try:
+            prepared.append((index, *_prepare_image_fastRCNN(image_data)))
+        except Exception as exc:
+            results[index] = _fastRCNN_http_exception(exc)
+
+    if not prepared:
+        return results
+
+    # Realiza a predição de todas as imagens do lote em uma única passagem
+    try:
+        model_breast_cancer_faster_rcnn = model_registry.get('breast_cancer_faster_rcnn')
+        with inference_runtime.inference_context():
+            predictions = model_breast_cancer_faster_rcnn([img_tensor for _, _, img_tensor in prepared])
     except Exception as exc:
-        raise HTTPException(
-            status_code=500,
-            detail="Ocorreu um erro ao processar a imagem. Por favor, tente novamente mais tarde."
-            ) from exc
+        error = _fastRCNN_http_exception(exc)
+        for index, _, _ in prepared:
+            results[index] = error
+        return results
+
+    # Limiar de confiança, NMS e anotação são aplicados por imagem
+    for (index, image, _), prediction in zip(prepared, predictions):
+        try:
+            boxes, labels, scores = _filter_prediction_fastRCNN(prediction)
+
+            # A anotação e a codificação JPEG só são feitas quando o cliente pediu a imagem
+            img_bytes = None
+            if annotate[index]:
+                img_bytes = _annotate_image_fastRCNN(image, boxes, scores)
+
+            results[index] = {
+                "image": img_bytes,
+                "detections": _build_detections_fastRCNN(boxes, labels, scores)
+            }
+        except Exception as exc:
+            results[index] = _fastRCNN_http_exception(exc)
 
+    return results
 
 
+def detect_breast_cancer_with_fastRCNN(image_data: bytes, annotate: bool = True):
+    result = detect_breast_cancer_with_fastRCNN_batch([image_data], [annotate])[0]
 
+    if isinstance(result, Exception):
+        raise result
 
+    return result
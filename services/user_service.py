@@ -6,22 +6,23 @@ from utils.is_email_valid import is_email_valid
 from utils.password_adapter import PasswordAdapter
 from utils.token_adapter import TokenAdapter
 from random import randint
-from config.settings import Settings
+from config.settings import get_settings
 from utils.send_email import send_email
 from datetime import timedelta
 import uuid
 from utils.logger import get_logger
+from utils.metrics import metrics
 import hashlib
 
 logger = get_logger(__name__)
 
-settings = Settings()
+settings = get_settings()
 
 class UserService:
-    def __init__(self):
-        self.user_repository = UserRepository()
-        self.password_adapter = PasswordAdapter()
-        self.token_adapter = TokenAdapter()
+    def __init__(self, user_repository: UserRepository = None, password_adapter: PasswordAdapter = None, token_adapter: TokenAdapter = None):
+        self.user_repository = user_repository or UserRepository()
+        self.password_adapter = password_adapter or PasswordAdapter()
+        self.token_adapter = token_adapter or TokenAdapter()
 
     async def create_user(self, user: CreateUser):
         try:
@@ -87,6 +88,13 @@ class UserService:
             if user_exists:
                 logger.info(f"User exists: {user_exists['id']}")
                 if await self.password_adapter.verify_password(user['password'], user_exists['password']):
+                    if self.password_adapter.needs_rehash(user_exists['password']):
+                        # Parâmetros do argon2 mudaram: regrava o hash com a senha já validada
+                        new_password = await self.password_adapter.hash_password(user['password'])
+                        rehashed = await self.user_repository.update_password_user(user_exists['id'], new_password)
+                        if rehashed['updated']:
+                            metrics.increment('password_rehash_total')
+                            logger.info(f"Password rehashed for user: {user_exists['id']}")
                     token = await self.token_adapter.create_token(user_exists['id'], user_exists['full_name'], user_exists['email'], user_exists['profile'])
                     if not token:
                         logger.error(f'Error logging in user: token could not be created')
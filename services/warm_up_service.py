@@ -0,0 +1,83 @@
+import io
+import time
+import numpy as np
+from PIL import Image
+from models.model_registry import model_registry
+from services import prediction_service
+from utils.metrics import metrics
+from config.settings import get_settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+
+def _synthetic_jpeg(size: int = 1024):
+    rng = np.random.default_rng(0)
+    buffer = io.BytesIO()
+    Image.fromarray(rng.integers(0, 256, (size, size, 3), dtype=np.uint8)).save(buffer, format='JPEG', quality=90)
+    return buffer.getvalue()
+
+
+def _raise_failed(results):
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+
+
+# Cada modelo é aquecido pelo mesmo caminho usado pelas rotas, incluindo o
+# pré-processamento, para que a primeira requisição real já encontre os
+# kernels escolhidos e a memória do modelo alocada
+WARMERS = {
+    'respiratory': lambda image: _raise_failed(prediction_service.predict_images([image])),
+    'breast_cancer': lambda image: prediction_service.detect_breast_cancer(image),
+    'breast_cancer_faster_rcnn': lambda image: _raise_failed(prediction_service.detect_breast_cancer_with_fastRCNN_batch([image]))
+}
+
+
+class ModelWarmUp:
+    def __init__(self, iterations: int = 2):
+        self.iterations = iterations
+        self.finished = False
+        self._status = {}
+
+    def run(self, names):
+        for name in names:
+            self._status[name] = {"ready": False, "load_ms": None, "first_inference_ms": None, "warm_inference_ms": None, "error": None}
+
+        image = _synthetic_jpeg()
+        for name in names:
+            status = self._status[name]
+            try:
+                start = time.perf_counter()
+                model_registry.get(name)
+                status["load_ms"] = (time.perf_counter() - start) * 1000
+
+                for iteration in range(self.iterations):
+                    start = time.perf_counter()
+                    WARMERS[name](image)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    status["first_inference_ms" if iteration == 0 else "warm_inference_ms"] = elapsed
+
+                status["ready"] = True
+                metrics.observe('model_warm_up_ms', status["load_ms"] + (status["first_inference_ms"] or 0))
+                logger.info(f'Model {name} warmed up (load {status["load_ms"]:.0f} ms, first inference {status["first_inference_ms"] or 0:.0f} ms)')
+            except Exception as e:
+                status["error"] = str(e)
+                logger.error(f'Error warming up model {name}: {e}')
+
+        self.finished = True
+
+    def is_ready(self):
+        return self.finished and all(status["ready"] for status in self._status.values())
+
+    def status(self):
+        return {
+            "ready": self.is_ready(),
+            "warm_up_finished": self.finished,
+            "models": self._status
+        }
+
+
+model_warm_up = ModelWarmUp(iterations=settings.warm_up_iterations)
@@ -0,0 +1,112 @@
+from functools import lru_cache
+from PIL import ImageDraw, ImageFont
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FONT_CANDIDATES = (
+    "arial.ttf",
+    # Se arial.ttf não estiver disponível, tenta DejaVuSans
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+)
+
+
+class AnnotationRenderer:
+    def __init__(self, font_candidates=FONT_CANDIDATES, font_cache_size: int = 64):
+        self.font_path = self._resolve_font_path(font_candidates)
+        self.get_font = lru_cache(maxsize=font_cache_size)(self._load_font)
+
+    @staticmethod
+    def _resolve_font_path(font_candidates):
+        for font_path in font_candidates:
+            try:
+                ImageFont.truetype(font_path, size=10)
+                logger.info(f'Annotation font resolved to {font_path}')
+                return font_path
+            except IOError:
+                continue
+        logger.info('No TrueType font found, using the default bitmap font for annotations')
+        return None
+
+    def _load_font(self, font_size: int):
+        if self.font_path is None:
+            return ImageFont.load_default()
+        return ImageFont.truetype(self.font_path, size=font_size)
+
+    def draw(self, image, boxes, scores):
+        # Anota a imagem
+        image_with_boxes = image.copy()
+        draw = ImageDraw.Draw(image_with_boxes)
+
+        # Calcula dimensões mínimas garantidas para visualização
+        image_width, image_height = image.size
+        min_line_width = max(3, int(min(image_width, image_height) * 0.005))
+        min_font_size = max(16, int(min(image_width, image_height) * 0.02))
+
+        for box, score in zip(boxes, scores):
+            xmin, ymin, xmax, ymax = box
+            xmin, ymin, xmax, ymax = int(xmin), int(ymin), int(xmax), int(ymax)
+
+            # Calcula a largura e altura da caixa delimitadora
+            box_width = xmax - xmin
+            box_height = ymax - ymin
+
+            # Define espessura da linha proporcional à imagem, com mínimo garantido
+            line_width = max(min_line_width, int(min(box_width, box_height) * 0.02))
+
+            # Define tamanho da fonte proporcional à imagem, com mínimo garantido
+            font_size = max(min_font_size, int(min(box_width, box_height) * 0.1))
+
+            # Fonte carregada uma única vez por tamanho
+            font = self.get_font(font_size)
+
+            # Desenha a caixa delimitadora com borda dupla para maior destaque
+            # Borda externa preta
+            draw.rectangle([(xmin-line_width, ymin-line_width), 
+                          (xmax+line_width, ymax+line_width)], 
+                          outline='black', width=line_width+2)
+            # Borda interna colorida
+            draw.rectangle([(xmin, ymin), (xmax, ymax)], 
+                         outline='red', width=line_width)
+
+            # Cria o texto com o rótulo e a pontuação
+            text = f"{score:.2f}"
+
+            # Calcula a posição e o tamanho do texto
+            text_size = draw.textbbox((0, 0), text, font=font)
+            text_width = text_size[2] - text_size[0]
+            text_height = text_size[3] - text_size[1]
+
+            # Adiciona padding ao texto para melhor legibilidade
+            padding = max(4, int(text_height * 0.2))
+
+            # Coordenadas para o fundo do texto
+            text_xmin = xmin
+            text_ymin = max(0, ymin - text_height - padding * 2)  # Garante que não saia da imagem
+            text_xmax = xmin + text_width + padding * 2
+            text_ymax = text_ymin + text_height + padding * 2
+
+            # Se o texto ficaria fora da imagem no topo, coloca abaixo da caixa
+            if text_ymin < 0:
+                text_ymin = min(ymax, image_height - text_height - padding * 2)
+                text_ymax = text_ymin + text_height + padding * 2
+
+            # Desenha um contorno preto ao redor do fundo do texto
+            draw.rectangle([(text_xmin-2, text_ymin-2), (text_xmax+2, text_ymax+2)], 
+                         fill='red')
+            # Desenha o retângulo de fundo para o texto
+            draw.rectangle([(text_xmin, text_ymin), (text_xmax, text_ymax)], 
+                         fill='red')
+
+            # Escreve o texto com contorno preto para maior contraste
+            for offset in [(1,1), (-1,-1), (1,-1), (-1,1)]:
+                draw.text((text_xmin + padding + offset[0], text_ymin + padding + offset[1]),
+                        text, fill='black', font=font)
+            # Texto principal em branco
+            draw.text((text_xmin + padding, text_ymin + padding),
+                     text, fill='white', font=font)
+
+        return image_with_boxes
+
+
+annotation_renderer = AnnotationRenderer()
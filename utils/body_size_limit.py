@@ -0,0 +1,75 @@
+from fastapi.responses import JSONResponse
+from utils.metrics import metrics
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+class BodySizeLimitMiddleware:
+    # Middleware ASGI: limita o corpo das rotas de upload enquanto ele chega,
+    # antes de o multipart ser todo recebido e gravado pelo Starlette
+    def __init__(self, app, limits: tuple):
+        # Pares (prefixo, limite em bytes); vale o primeiro prefixo que casar
+        self.app = app
+        self.limits = limits
+
+    def _max_bytes(self, path: str):
+        for prefix, max_bytes in self.limits:
+            if path.startswith(prefix):
+                return max_bytes
+        return None
+
+    async def __call__(self, scope, receive, send):
+        max_bytes = self._max_bytes(scope["path"]) if scope["type"] == "http" else None
+        if max_bytes is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b'content-length')
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            await self._reject(scope, receive, send, max_bytes)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    exceeded = True
+                    raise BodyTooLarge()
+            return message
+
+        async def limited_send(message):
+            nonlocal response_started
+            # O FastAPI converte erros na leitura do corpo em 400; quando o
+            # motivo foi o limite, a resposta é trocada pelo 413
+            if exceeded:
+                if message["type"] == "http.response.start" and not response_started:
+                    response_started = True
+                    await self._reject(scope, receive, send, max_bytes)
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, limited_send)
+        except BodyTooLarge:
+            if response_started:
+                raise
+            await self._reject(scope, receive, send, max_bytes)
+
+    async def _reject(self, scope, receive, send, max_bytes: int):
+        metrics.increment('upload_rejected_size_total')
+        response = JSONResponse(
+            status_code=413,
+            content={"detail": f"The request body exceeds the maximum size of {max_bytes} bytes."}
+        )
+        await response(scope, receive, send)
@@ -1,34 +1,90 @@
+from collections import OrderedDict
+import threading
+import time
 from fastapi import Request, HTTPException
+from fastapi.responses import JSONResponse
 import jwt
-from config.settings import Settings
+from config.settings import get_settings
 from utils import list_routes_user_common
+from utils.metrics import metrics
+
+settings = get_settings()
+
+# Políticas de rota montadas uma única vez, na importação
+ALLOWED_PATH_PREFIXES = (
+    '/login',
+    '/login-pronto',
+    '/send-verification-code/',
+    '/confirm-code-verification/',
+    '/forgot/update-password/',
+    '/resend-verification-code/'
+)
+USER_COMMON_ROUTES = frozenset(list_routes_user_common.list_routes_user_common())
+USER_COMMON_PATH_PREFIXES = (
+    '/detect/result/',
+    '/jobs/',
+)
+PUBLIC_ROUTES = frozenset([
+    '/',
+    '/docs',
+    '/docs/oauth2-redirect',
+    '/redoc',
+    '/openapi.json',
+    '/health/live',
+    '/health/ready'
+])
+
+
+class VerifiedTokenCache:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            claims, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return claims
+
+    def put(self, token: str, claims: dict):
+        expires_at = claims.get('exp')
+        # Tokens sem expiração não são guardados: sempre passam pela verificação completa
+        if expires_at is None or self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[token] = (claims, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+token_cache = VerifiedTokenCache(settings.token_cache_size)
 
-settings = Settings()
 
 class CredentialsMiddleware:
 
     @staticmethod
     async def verify_credentials(request: Request):
-        list_routes = list_routes_user_common.list_routes_user_common()
         api_key = request.headers.get('api_key')
         token_value = request.headers.get('Authorization')
-        allowed_paths = [
-            '/login',
-            '/login-pronto',
-            '/send-verification-code/',
-            '/confirm-code-verification/',
-            '/forgot/update-password/',
-            '/resend-verification-code/'
-        ]
-        if any([request.url.path.startswith(path) for path in allowed_paths]):
+        path = request.url.path
+        if path.startswith(ALLOWED_PATH_PREFIXES):
             CredentialsMiddleware.verify_api_key(api_key)
-        elif request.url.path in list_routes:
+        elif path in USER_COMMON_ROUTES or path.startswith(USER_COMMON_PATH_PREFIXES):
             CredentialsMiddleware.verify_api_key(api_key)
-            CredentialsMiddleware.verify_token(token_value)
+            request.state.claims = CredentialsMiddleware.verify_token(token_value)
         else:
             CredentialsMiddleware.verify_api_key(api_key)
-            CredentialsMiddleware.verify_token(token_value)
-            CredentialsMiddleware.can_access_admin(token_value)
+            claims = CredentialsMiddleware.verify_token(token_value)
+            CredentialsMiddleware.can_access_admin(claims)
+            request.state.claims = claims
 
 
     @staticmethod
@@ -40,24 +96,58 @@ class CredentialsMiddleware:
     
 
     @staticmethod
-    def verify_token(token_value: str):
+    def verify_token(token_value: str) -> dict:
         if token_value:
-            token = token_value.split(' ')[1]
+            parts = token_value.split(' ')
+            if len(parts) < 2:
+                raise HTTPException(status_code=403, detail={"message": "Invalid token", "status_code": 403})
+            token = parts[1]
+
+            claims = token_cache.get(token)
+            if claims is not None:
+                metrics.increment('token_cache_hits_total')
+                return claims
+
+            metrics.increment('token_cache_misses_total')
             try:
-                jwt.decode(token, settings.secret_key, algorithms=['HS256'])
+                claims = jwt.decode(token, settings.secret_key, algorithms=['HS256'])
             except jwt.ExpiredSignatureError:
                 raise HTTPException(status_code=403, detail={"message": "Token expired", "status_code": 403})
             except jwt.InvalidTokenError:
                 raise HTTPException(status_code=403, detail={"message": "Invalid token", "status_code": 403})
+
+            token_cache.put(token, claims)
+            return claims
         else:
             raise HTTPException(status_code=400, detail={"message": "Token is required", "status_code": 400})
         
     
     @staticmethod
-    def can_access_admin(token_value: str):
-        token = token_value.split(' ')[1]
-        decoded_token = jwt.decode(token, settings.secret_key, algorithms=['HS256'])
-        if decoded_token['profile'] != 'Administrador':
+    def can_access_admin(claims: dict):
+        if claims.get('profile') != 'Administrador':
             raise HTTPException(status_code=403, detail={"message": "Unauthorized. This request can only be made by administrators.", "status_code": 403})
-       
-        
\ No newline at end of file
+
+
+class AuthenticationMiddleware:
+    # Middleware ASGI: autentica pelos cabeçalhos antes de qualquer leitura do
+    # corpo, então uploads rejeitados não chegam a ser recebidos nem processados
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope["path"] in PUBLIC_ROUTES:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await CredentialsMiddleware.verify_credentials(Request(scope))
+        except HTTPException as exc:
+            metrics.increment('auth_rejected_total')
+            response = JSONResponse(content={"detail": exc.detail}, status_code=exc.status_code, headers=exc.headers)
+            await response(scope, receive, send)
+            return
+        finally:
+            metrics.observe('auth_ms', (time.perf_counter() - start) * 1000)
+
+        await self.app(scope, receive, send)
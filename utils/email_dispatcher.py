@@ -0,0 +1,106 @@
+import asyncio
+import uuid
+import httpx
+from config.settings import get_settings
+from repository.email_outbox_repository import EmailOutboxRepository
+from utils.metrics import metrics
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+
+class EmailDispatcher:
+    def __init__(self):
+        self.outbox_repository = EmailOutboxRepository()
+        self._client = None
+        self._task = None
+        self._table_ready = False
+        self._wake_up = asyncio.Event()
+
+    async def enqueue(self, payload: dict) -> bool:
+        email_added = await self.outbox_repository.add_email(str(uuid.uuid4()), payload)
+        if email_added['added']:
+            metrics.increment('email_enqueued_total')
+            self._wake_up.set()
+        return email_added['added']
+
+    async def start(self):
+        # Cliente compartilhado para reaproveitar as conexões com o serviço de e-mail
+        self._client = httpx.AsyncClient(timeout=settings.mail_timeout_seconds)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _run(self):
+        while True:
+            try:
+                # A tabela é criada aqui, e não no start, para que o worker suba
+                # mesmo com o Postgres fora do ar; a criação é tentada de novo
+                # a cada ciclo até dar certo
+                if not self._table_ready:
+                    self._table_ready = await self.outbox_repository.create_table()
+
+                emails = []
+                if self._table_ready:
+                    emails = await self.outbox_repository.claim_due_emails(
+                        limit=10,
+                        lease_seconds=settings.mail_timeout_seconds * 2
+                    )
+
+                # Os e-mails reivindicados são enviados em paralelo e cada envio
+                # tem prazo total de mail_timeout_seconds, então todos terminam
+                # antes de o lease vencer e outro worker reenviar o mesmo e-mail
+                results = await asyncio.gather(*(self._deliver(email) for email in emails), return_exceptions=True)
+                for email, result in zip(emails, results):
+                    if isinstance(result, Exception):
+                        logger.error(f"Error delivering email {email['id']}: {result}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f'Error dispatching emails: {e}')
+                emails = []
+
+            if emails:
+                continue
+
+            self._wake_up.clear()
+            try:
+                await asyncio.wait_for(self._wake_up.wait(), timeout=settings.email_dispatch_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _deliver(self, email: dict):
+        attempts = email['attempts'] + 1
+        try:
+            response = await asyncio.wait_for(
+                self._client.post(settings.mail_service_url, json=email['payload']),
+                timeout=settings.mail_timeout_seconds
+            )
+            response.raise_for_status()
+        except (httpx.HTTPError, asyncio.TimeoutError) as e:
+            dead = attempts >= settings.email_max_attempts
+            # Backoff exponencial limitado entre as tentativas
+            retry_in_seconds = min(settings.email_retry_base_seconds * 2 ** (attempts - 1), settings.email_retry_max_seconds)
+            await self.outbox_repository.mark_failed(email['id'], attempts, retry_in_seconds, str(e), dead)
+            metrics.increment('email_failed_total' if dead else 'email_retried_total')
+            logger.error(f"Error sending email {email['id']} (attempt {attempts}): {e}")
+            return
+
+        await self.outbox_repository.mark_sent(email['id'])
+        metrics.increment('email_sent_total')
+        logger.info(f"Email {email['id']} sent")
+
+
+email_dispatcher = EmailDispatcher()
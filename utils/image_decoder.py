@@ -0,0 +1,41 @@
+import io
+import numpy as np
+import torch
+from PIL import Image
+
+RESAMPLING_MODES = {
+    "fast": Image.Resampling.BILINEAR,
+    "balanced": Image.Resampling.BICUBIC,
+    "quality": Image.Resampling.LANCZOS,
+}
+
+
+def target_size(width: int, height: int, max_dimension: int):
+    # Calcula a nova dimensão mantendo a proporção
+    if width <= max_dimension and height <= max_dimension:
+        return width, height
+    if width > height:
+        return max_dimension, int((height * max_dimension) / width)
+    return int((width * max_dimension) / height), max_dimension
+
+
+def decode_and_resize(image_data: bytes, max_dimension: int, resampling: str = "quality"):
+    image = Image.open(io.BytesIO(image_data))
+    size = target_size(image.width, image.height, max_dimension)
+
+    if image.format == 'JPEG' and size != image.size:
+        # Decodifica o JPEG já reduzido (1/2, 1/4 ou 1/8) direto na IDCT,
+        # sem nunca materializar a imagem em resolução total
+        image.draft('RGB', size)
+
+    image = image.convert('RGB')
+
+    if image.size != size:
+        image = image.resize(size, RESAMPLING_MODES[resampling])
+
+    # Uma única cópia para o numpy e outra para o tensor float contíguo (C, H, W)
+    img_tensor = torch.from_numpy(np.array(image))
+    img_tensor = img_tensor.permute(2, 0, 1).to(dtype=torch.float32, memory_format=torch.contiguous_format)
+    img_tensor.div_(255)
+
+    return image, img_tensor
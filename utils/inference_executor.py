@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from config.settings import get_settings
+from utils.metrics import metrics
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+
+class InferenceExecutor:
+    def __init__(self, max_workers: int, max_queue_size: int, retry_after: int):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='inference')
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+
+    async def run(self, func, *args, **kwargs):
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue_size:
+                metrics.increment('inference_rejected_total')
+                logger.error('Inference queue is full, rejecting request')
+                raise HTTPException(
+                    status_code=503,
+                    detail="The inference service is busy. Please try again later.",
+                    headers={"Retry-After": str(self.retry_after)}
+                )
+            self._pending += 1
+            self._update_gauges()
+
+        submitted_at = time.perf_counter()
+
+        def task():
+            started_at = time.perf_counter()
+            metrics.observe('inference_queue_wait_ms', (started_at - submitted_at) * 1000)
+            with self._lock:
+                self._running += 1
+                self._update_gauges()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.observe('inference_run_ms', (time.perf_counter() - started_at) * 1000)
+                with self._lock:
+                    self._running -= 1
+                    self._update_gauges()
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, task)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._update_gauges()
+
+    def _update_gauges(self):
+        metrics.set_gauge('inference_queue_depth', self._pending - self._running)
+        metrics.set_gauge('inference_in_flight', self._running)
+
+
+inference_executor = InferenceExecutor(
+    max_workers=settings.inference_workers,
+    max_queue_size=settings.inference_queue_size,
+    retry_after=settings.inference_retry_after
+)
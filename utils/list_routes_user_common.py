@@ -1,5 +1,9 @@
 def list_routes_user_common():
     return [
         "/predict",
+        "/detect",
+        "/predict/batch",
+        "/detect/batch",
+        "/jobs/detect",
         "/feedback",
     ]
\ No newline at end of file
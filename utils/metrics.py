@@ -0,0 +1,53 @@
+import threading
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._timers = {}
+        self._collectors = {}
+
+    def increment(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float):
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value_ms: float):
+        with self._lock:
+            timer = self._timers.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            timer["count"] += 1
+            timer["total_ms"] += value_ms
+            timer["max_ms"] = max(timer["max_ms"], value_ms)
+
+    def register_collector(self, name: str, collector):
+        # Coletores são chamados apenas no snapshot, para métricas que já
+        # existem em outro objeto (ex.: estatísticas de pools)
+        with self._lock:
+            self._collectors[name] = collector
+
+    def snapshot(self):
+        with self._lock:
+            timers = {
+                name: {
+                    **timer,
+                    "avg_ms": timer["total_ms"] / timer["count"] if timer["count"] else 0.0
+                } for name, timer in self._timers.items()
+            }
+            snapshot = {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "timers": timers,
+            }
+            collectors = dict(self._collectors)
+
+        for name, collector in collectors.items():
+            snapshot[name] = collector()
+        return snapshot
+
+
+metrics = Metrics()
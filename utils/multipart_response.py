@@ -0,0 +1,22 @@
+import json
+import uuid
+
+
+def build_multipart_mixed(detections: list, image: bytes):
+    boundary = uuid.uuid4().hex
+
+    json_part = json.dumps({"detections": detections}).encode('utf-8')
+
+    # As partes são concatenadas uma única vez, sem passar a imagem por base64
+    body = b''.join([
+        f'--{boundary}\r\n'.encode(),
+        b'Content-Type: application/json\r\n\r\n',
+        json_part,
+        f'\r\n--{boundary}\r\n'.encode(),
+        b'Content-Type: image/jpeg\r\n',
+        f'Content-Length: {len(image)}\r\n\r\n'.encode(),
+        image,
+        f'\r\n--{boundary}--\r\n'.encode(),
+    ])
+
+    return body, f'multipart/mixed; boundary={boundary}'
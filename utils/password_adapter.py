@@ -1,11 +1,84 @@
+import asyncio
+import multiprocessing
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from passlib.hash import argon2
+from config.settings import get_settings
+from utils.metrics import metrics
+
+settings = get_settings()
+
+_executor = None
+
+_ARGON2_PARAMS = re.compile(r'\$m=(\d+),t=(\d+),p=(\d+)\$')
+
+
+def _hasher():
+    return argon2.using(
+        time_cost=settings.argon2_time_cost,
+        memory_cost=settings.argon2_memory_cost,
+        parallelism=settings.argon2_parallelism
+    )
+
+
+def _hash(password: str) -> str:
+    return _hasher().hash(password)
+
+
+def _verify(password: str, hash_password: str) -> bool:
+    return argon2.verify(password, hash_password)
+
+
+def _is_downgrade(hash_password: str) -> bool:
+    # Nunca regrava um hash com custo menor que o já armazenado
+    match = _ARGON2_PARAMS.search(hash_password)
+    if not match:
+        return False
+    memory_cost, time_cost, parallelism = (int(value) for value in match.groups())
+    return (
+        settings.argon2_memory_cost < memory_cost
+        or settings.argon2_time_cost < time_cost
+        or settings.argon2_parallelism < parallelism
+    )
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        # spawn evita herdar as threads e os modelos carregados no processo da API
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.password_hash_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    return _executor
+
+
+def shutdown_password_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def _run(metric_name: str, func, *args):
+    start = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_executor(), func, *args)
+    finally:
+        metrics.observe(metric_name, (time.perf_counter() - start) * 1000)
 
 
 class PasswordAdapter:
     @staticmethod
     async def hash_password(password: str) -> str:
-        return argon2.hash(password)
+        return await _run('password_hash_ms', _hash, password)
 
     @staticmethod
     async def verify_password(password: str, hash_password: str) -> bool:
-        return argon2.verify(password, hash_password)
+        return await _run('password_verify_ms', _verify, password, hash_password)
+
+    @staticmethod
+    def needs_rehash(hash_password: str) -> bool:
+        # Verdadeiro quando o hash foi gerado com parâmetros diferentes dos atuais
+        return _hasher().needs_update(hash_password) and not _is_downgrade(hash_password)
@@ -0,0 +1,11 @@
+def probs_to_dictionary(probs, names):
+    result_dict = {}
+
+    # Uma única cópia do tensor para a CPU com as cinco maiores probabilidades
+    top5 = probs.top5
+    values = probs.data[top5].tolist()
+
+    for index, value in zip(top5, values):
+        # Mesmo arredondamento de duas casas usado pelo save_txt do ultralytics
+        result_dict[names[index]] = float(f"{value:.2f}") * 100
+    return result_dict
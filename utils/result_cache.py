@@ -0,0 +1,195 @@
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from config.settings import get_settings
+from utils.metrics import metrics
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+
+def file_fingerprint(path: str) -> str:
+    # Tamanho e data de modificação bastam para invalidar o cache quando o
+    # arquivo de pesos é trocado, sem precisar ler o arquivo inteiro
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return 'missing'
+    return f'{stat.st_size}-{stat.st_mtime_ns}'
+
+
+def _encode_bytes(value):
+    if isinstance(value, bytes):
+        return {"__base64__": base64.b64encode(value).decode('ascii')}
+    raise TypeError(f'Object of type {type(value).__name__} is not cacheable')
+
+
+def _decode_bytes(value: dict):
+    if len(value) == 1 and "__base64__" in value:
+        return base64.b64decode(value["__base64__"])
+    return value
+
+
+def serialize(value) -> bytes:
+    # JSON em vez de pickle: o diretório em disco é compartilhado pelos
+    # workers, e carregar um pickle dali permitiria executar código
+    return json.dumps(value, default=_encode_bytes, separators=(',', ':')).encode('utf-8')
+
+
+def deserialize(payload: bytes):
+    return json.loads(payload, object_hook=_decode_bytes)
+
+
+class ResultCache:
+    def __init__(self, name: str, max_bytes: int, disk_dir: str = "", disk_max_bytes: int = 0):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._disk_bytes = None
+        self._lock = threading.Lock()
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(content: bytes, *parts) -> str:
+        digest = hashlib.sha256(content)
+        for part in parts:
+            digest.update(b'\0' + str(part).encode('utf-8'))
+        return digest.hexdigest()
+
+    async def get_async(self, key: str):
+        # Leitura em disco e desserialização rodam fora do event loop
+        return await asyncio.to_thread(self.get, key)
+
+    async def put_async(self, key: str, value):
+        await asyncio.to_thread(self.put, key, value)
+
+    def get(self, key: str):
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+
+        if payload is None and self.disk_dir:
+            payload = self._disk_get(key)
+            if payload is not None:
+                self._memory_put(key, payload)
+
+        if payload is None:
+            metrics.increment(f'{self.name}_cache_miss_total')
+            return None
+
+        metrics.increment(f'{self.name}_cache_hit_total')
+        try:
+            return deserialize(payload)
+        except ValueError as e:
+            logger.error(f'Discarding unreadable cached result {key}: {e}')
+            return None
+
+    def put(self, key: str, value):
+        # O valor é guardado serializado: o tamanho contabilizado é exato e o
+        # resultado devolvido em um hit nunca é o mesmo objeto de outra resposta
+        payload = serialize(value)
+        self._memory_put(key, payload)
+        if self.disk_dir:
+            self._disk_put(key, payload)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "disk_bytes": self._disk_bytes
+            }
+
+    def _memory_put(self, key: str, payload: bytes):
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = payload
+            self._bytes += len(payload)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                metrics.increment(f'{self.name}_cache_eviction_total')
+
+    def _disk_get(self, key: str):
+        path = os.path.join(self.disk_dir, key)
+        try:
+            with open(path, 'rb') as file:
+                payload = file.read()
+            # A data de acesso ordena a remoção no disco (LRU aproximado)
+            os.utime(path)
+            return payload
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.error(f'Error reading cached result {key}: {e}')
+            return None
+
+    def _disk_put(self, key: str, payload: bytes):
+        if len(payload) > self.disk_max_bytes:
+            return
+        path = os.path.join(self.disk_dir, key)
+        try:
+            temp_path = f'{path}.{os.getpid()}.tmp'
+            with open(temp_path, 'wb') as file:
+                file.write(payload)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.error(f'Error writing cached result {key}: {e}')
+            return
+
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += len(payload)
+            if self._disk_bytes is None or self._disk_bytes > self.disk_max_bytes:
+                self._evict_disk()
+
+    def _evict_disk(self):
+        # O diretório pode ser compartilhado por vários workers, então o total é
+        # recalculado a partir do disco antes de remover os arquivos mais antigos
+        entries = []
+        for entry in os.scandir(self.disk_dir):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                metrics.increment(f'{self.name}_cache_disk_eviction_total')
+            except FileNotFoundError:
+                total -= size
+            except OSError as e:
+                logger.error(f'Error evicting cached result {path}: {e}')
+        self._disk_bytes = total
+
+
+def _disk_dir(name: str):
+    return os.path.join(settings.result_cache_dir, name) if settings.result_cache_dir else ""
+
+
+predict_cache = ResultCache('predict', settings.result_cache_max_bytes, _disk_dir('predict'), settings.result_cache_disk_max_bytes)
+detect_cache = ResultCache('detect', settings.result_cache_max_bytes, _disk_dir('detect'), settings.result_cache_disk_max_bytes)
+
+metrics.register_collector('result_cache', lambda: {"predict": predict_cache.stats(), "detect": detect_cache.stats()})
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import threading
+import time
+import uuid
+from config.settings import get_settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+
+class ResultStore:
+    # Os resultados ficam em disco para que qualquer worker do mesmo host
+    # consiga servir a URL gerada por outro worker
+    def __init__(self, directory: str, ttl_seconds: float):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        # A varredura do diretório roda no máximo uma vez por intervalo, e não
+        # a cada resultado gravado
+        self.cleanup_interval = min(ttl_seconds, 60)
+        self._next_cleanup = 0.0
+        self._cleanup_lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def put(self, content: bytes) -> str:
+        if self._cleanup_due():
+            self.remove_expired()
+        result_id = uuid.uuid4().hex
+        temp_path = self._path(result_id) + '.tmp'
+        with open(temp_path, 'wb') as file:
+            file.write(content)
+        os.replace(temp_path, self._path(result_id))
+        return result_id
+
+    def get_path(self, result_id: str):
+        if not result_id.isalnum():
+            return None
+        path = self._path(result_id)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                os.remove(path)
+                return None
+        except FileNotFoundError:
+            return None
+        return path
+
+    def _cleanup_due(self) -> bool:
+        now = time.monotonic()
+        with self._cleanup_lock:
+            if now < self._next_cleanup:
+                return False
+            self._next_cleanup = now + self.cleanup_interval
+            return True
+
+    def remove_expired(self):
+        now = time.time()
+        for entry in os.scandir(self.directory):
+            try:
+                if now - entry.stat().st_mtime > self.ttl_seconds:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.error(f'Error removing expired result {entry.name}: {e}')
+
+    def _path(self, result_id: str):
+        return os.path.join(self.directory, result_id)
+
+
+result_store = ResultStore(
+    directory=settings.result_store_dir or os.path.join(tempfile.gettempdir(), 'xpredict-results'),
+    ttl_seconds=settings.result_store_ttl_seconds
+)
@@ -1,15 +1,17 @@
-import smtplib
-import email.message
-from config.settings import Settings
-import requests as req
+from config.settings import get_settings
+from utils.email_dispatcher import email_dispatcher
+from utils.logger import get_logger
 
-settings = Settings()
+logger = get_logger(__name__)
+
+settings = get_settings()
 
 
 async def send_email(user, email_user, code_verification, app_name):
 
     try:
-        result = req.post('https://simple-mail-compose-simple-mail.o3luz9.easypanel.host/send-email', json={
+        # O e-mail vai para a outbox e é enviado em segundo plano pelo dispatcher
+        return await email_dispatcher.enqueue({
             "from": settings.EMAIL,
             "to": email_user,
             "subject": f"Recuperação de senha {app_name}",
@@ -19,7 +21,6 @@ async def send_email(user, email_user, code_verification, app_name):
             },
             "template": "main"
         })
-        return True
     except Exception as e:
-        print("Error: ", e)
-        return False
\ No newline at end of file
+        logger.error(f'Error enqueuing email: {e}')
+        return False
@@ -1,8 +1,8 @@
 import jwt
 import datetime
-from config.settings import Settings
+from config.settings import get_settings
 
-settings = Settings()
+settings = get_settings()
 
 
 class TokenAdapter:
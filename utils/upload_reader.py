@@ -0,0 +1,191 @@
+import asyncio
+import io
+import zipfile
+import zlib
+from fastapi import UploadFile, HTTPException
+from PIL import Image
+from config.settings import get_settings
+from utils.metrics import metrics
+
+settings = get_settings()
+
+READ_CHUNK_BYTES = 64 * 1024
+# O cabeçalho de um JPEG pode vir depois de um bloco EXIF grande (até 64 KB)
+MAX_HEADER_BYTES = 256 * 1024
+
+ZIP_SIGNATURE = b'PK\x03\x04'
+
+# Erros de um membro específico (criptografado, deflate corrompido, método de
+# compressão não suportado): viram falha só daquele arquivo
+ZIP_MEMBER_ERRORS = (RuntimeError, NotImplementedError, zlib.error, zipfile.BadZipFile, OSError)
+
+IMAGE_SIGNATURES = (
+    (b'\xff\xd8\xff', 'JPEG'),
+    (b'\x89PNG\r\n\x1a\n', 'PNG'),
+    (b'II*\x00', 'TIFF'),
+    (b'MM\x00*', 'TIFF'),
+    (b'BM', 'BMP'),
+)
+
+
+def sniff_format(head: bytes):
+    for signature, image_format in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return image_format
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'WEBP'
+    return None
+
+
+def read_dimensions(head: bytes, max_pixels: int = None):
+    # Image.open lê apenas o cabeçalho; os pixels não são decodificados
+    try:
+        with Image.open(io.BytesIO(head)) as image:
+            return image.size
+    except Image.DecompressionBombError:
+        # O Pillow recusa o cabeçalho por excesso de pixels: não é um
+        # cabeçalho incompleto, então não adianta ler mais bytes
+        max_pixels = max_pixels or settings.upload_max_pixels
+        _reject(413, 'pixels', f"The image is too large. The maximum is {max_pixels} pixels.")
+    except Exception:
+        return None
+
+
+def _reject(status_code: int, reason: str, detail: str):
+    metrics.increment(f'upload_rejected_{reason}_total')
+    raise HTTPException(status_code=status_code, detail=detail)
+
+
+async def read_image_upload(file: UploadFile, max_bytes: int = None, max_pixels: int = None):
+    max_bytes = max_bytes or settings.upload_max_bytes
+    max_pixels = max_pixels or settings.upload_max_pixels
+
+    if file.size is not None and file.size > max_bytes:
+        _reject(413, 'size', f"The file exceeds the maximum size of {max_bytes} bytes.")
+
+    # Formato e dimensões são verificados com os primeiros KB, antes de ler o resto
+    head = await file.read(READ_CHUNK_BYTES)
+    if sniff_format(head) is None:
+        _reject(415, 'format', "Unsupported file type. Please send a JPEG, PNG, TIFF, BMP or WEBP image.")
+
+    size = read_dimensions(head, max_pixels)
+    while size is None and len(head) < MAX_HEADER_BYTES:
+        chunk = await file.read(READ_CHUNK_BYTES)
+        if not chunk:
+            break
+        head += chunk
+        size = read_dimensions(head, max_pixels)
+
+    if size is None:
+        _reject(400, 'header', "An error occurred while processing the image. Please check that the image is in the correct format and try again.")
+
+    width, height = size
+    if width * height > max_pixels:
+        _reject(413, 'pixels', f"The image is too large ({width}x{height}). The maximum is {max_pixels} pixels.")
+
+    chunks = [head]
+    total = len(head)
+    while chunk := await file.read(READ_CHUNK_BYTES):
+        total += len(chunk)
+        if total > max_bytes:
+            _reject(413, 'size', f"The file exceeds the maximum size of {max_bytes} bytes.")
+        chunks.append(chunk)
+
+    if total > max_bytes:
+        _reject(413, 'size', f"The file exceeds the maximum size of {max_bytes} bytes.")
+
+    return b''.join(chunks)
+
+
+def validate_image_bytes(data: bytes, max_bytes: int = None, max_pixels: int = None):
+    max_bytes = max_bytes or settings.upload_max_bytes
+    max_pixels = max_pixels or settings.upload_max_pixels
+
+    if len(data) > max_bytes:
+        _reject(413, 'size', f"The file exceeds the maximum size of {max_bytes} bytes.")
+    if sniff_format(data) is None:
+        _reject(415, 'format', "Unsupported file type. Please send a JPEG, PNG, TIFF, BMP or WEBP image.")
+
+    size = read_dimensions(data[:MAX_HEADER_BYTES], max_pixels)
+    if size is None:
+        _reject(400, 'header', "An error occurred while processing the image. Please check that the image is in the correct format and try again.")
+
+    width, height = size
+    if width * height > max_pixels:
+        _reject(413, 'pixels', f"The image is too large ({width}x{height}). The maximum is {max_pixels} pixels.")
+
+    return data
+
+
+def _is_image_member(info: zipfile.ZipInfo):
+    name = info.filename
+    return not (info.is_dir() or name.startswith('__MACOSX/') or name.rsplit('/', 1)[-1].startswith('.'))
+
+
+def _expand_zip(archive_name: str, archive: bytes, budget_bytes: int, remaining_files: int, max_files: int):
+    entries = []
+    try:
+        with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+            members = [info for info in zip_file.infolist() if _is_image_member(info)]
+            # O limite de arquivos é verificado pelo diretório central do zip,
+            # antes de ler ou decodificar qualquer membro
+            if len(members) > remaining_files:
+                _reject(413, 'files', f"The batch exceeds the maximum of {max_files} images.")
+
+            for info in members:
+                name = info.filename
+                filename = f'{archive_name}/{name}'
+                try:
+                    if info.file_size > settings.upload_max_bytes:
+                        _reject(413, 'size', f"The file exceeds the maximum size of {settings.upload_max_bytes} bytes.")
+                    # O tamanho declarado no zip não é confiável: a leitura é
+                    # limitada para que um zip bomb não estoure a memória
+                    try:
+                        with zip_file.open(info) as member:
+                            data = member.read(settings.upload_max_bytes + 1)
+                    except ZIP_MEMBER_ERRORS:
+                        _reject(400, 'zip_member', "The file could not be extracted from the zip archive.")
+                    budget_bytes -= len(data)
+                    if budget_bytes < 0:
+                        _reject(413, 'size', f"The uncompressed batch exceeds the maximum size of {settings.batch_max_bytes} bytes.")
+                    entries.append((filename, validate_image_bytes(data)))
+                except HTTPException as exc:
+                    if budget_bytes < 0:
+                        raise
+                    entries.append((filename, exc))
+    except zipfile.BadZipFile:
+        entries.append((archive_name, HTTPException(status_code=400, detail="Invalid zip file.")))
+    return entries, budget_bytes
+
+
+async def read_batch_upload(files: list, max_files: int = None, max_bytes: int = None):
+    # Cada arquivo vira uma entrada (nome, bytes) ou (nome, HTTPException), na
+    # ordem de envio; arquivos zip são expandidos na ordem interna do arquivo
+    max_files = max_files or settings.batch_max_files
+    budget_bytes = max_bytes or settings.batch_max_bytes
+    entries = []
+
+    for file in files:
+        signature = await file.read(len(ZIP_SIGNATURE))
+        await file.seek(0)
+
+        if signature == ZIP_SIGNATURE:
+            archive = await file.read()
+            expanded, budget_bytes = await asyncio.to_thread(
+                _expand_zip, file.filename, archive, budget_bytes, max_files - len(entries), max_files
+            )
+            entries.extend(expanded)
+        else:
+            try:
+                data = await read_image_upload(file)
+                budget_bytes -= len(data)
+                entries.append((file.filename, data))
+            except HTTPException as exc:
+                entries.append((file.filename, exc))
+
+        if budget_bytes < 0:
+            _reject(413, 'size', f"The batch exceeds the maximum size of {settings.batch_max_bytes} bytes.")
+        if len(entries) > max_files:
+            _reject(413, 'files', f"The batch exceeds the maximum of {max_files} images.")
+
+    return entries